@@ -0,0 +1,229 @@
+"""
+Letter-Constraint Index for Candidate Filtering
+
+Instead of replaying generate_feedback against every candidate after every
+guess, feedback is folded into a small set of letter constraints:
+
+- a 26-bit mask of letters still allowed at each position
+- a minimum and maximum count for each letter
+
+A ConstraintIndex precomputes, for every word, its letter at each position
+(as a one-hot bit), a 26-bit letter-presence mask and its per-letter counts,
+so filtering is a few bitwise operations over those arrays. constraint_index
+keeps the index of recently used word lists, so filtering the same list
+again (or restricting the same guess pool every turn) reuses its arrays.
+
+The constraints reproduce generate_feedback exactly, including repeated
+letters: a letter that is gray somewhere and green/yellow elsewhere is
+capped at its green+yellow count rather than excluded outright.
+
+The same machinery restricts guesses in hard mode (see hard_mode_constraints):
+'strict' allows only guesses consistent with all feedback so far, 'nyt'
+follows the NYT rule (greens stay in place, revealed letters are reused).
+"""
+
+import numpy as np
+
+from feedback import GREEN, YELLOW, WORD_LENGTH, as_feedback_code
+from pattern_matrix import encode_words
+
+NUM_LETTERS = 26
+ALL_LETTERS = (1 << NUM_LETTERS) - 1
+
+HARD_MODES = ('strict', 'nyt')
+
+# Word lists whose ConstraintIndex is kept by constraint_index
+INDEX_CACHE_SIZE = 8
+
+_indexes = {}
+
+
+def _letter_index(letter):
+    return ord(letter.lower()) - ord('a')
+
+
+def _feedback_digits(feedback):
+    code = as_feedback_code(feedback)
+    digits = []
+    for _ in range(WORD_LENGTH):
+        code, digit = divmod(code, 3)
+        digits.append(digit)
+    return digits
+
+
+class Constraints:
+    """
+    Letter constraints accumulated from (guess, feedback) pairs.
+
+    With hints_only=True only the revealed hints are kept (greens fixed in
+    place, green/yellow letters required), as in NYT hard mode.
+    """
+
+    def __init__(self, hints_only=False):
+        self.hints_only = hints_only
+        self.allowed = [ALL_LETTERS] * WORD_LENGTH
+        self.min_counts = [0] * NUM_LETTERS
+        self.max_counts = [WORD_LENGTH] * NUM_LETTERS
+        self.satisfiable = True
+
+    def copy(self):
+        """Independent copy (so a state can be branched or undone)."""
+        other = Constraints(self.hints_only)
+        other.allowed = list(self.allowed)
+        other.min_counts = list(self.min_counts)
+        other.max_counts = list(self.max_counts)
+        other.satisfiable = self.satisfiable
+        return other
+
+    def add(self, guess, feedback):
+        """
+        Fold one guess and its feedback into the constraints.
+
+        Feedback may be a tuple of ("Green", "Yellow", "Gray") or a pattern code.
+        Returns self so calls can be chained.
+        """
+        digits = _feedback_digits(feedback)
+        letters = [_letter_index(ch) for ch in guess]
+
+        # Per letter: greens, yellows, and whether a gray follows the yellows
+        revealed = {}
+        capped = set()
+        for i, (letter, digit) in enumerate(zip(letters, digits)):
+            bit = 1 << letter
+            if digit == GREEN:
+                self.allowed[i] &= bit
+                revealed[letter] = revealed.get(letter, 0) + 1
+                continue
+
+            if self.hints_only:
+                # Hard mode only carries revealed letters forward
+                if digit == YELLOW:
+                    revealed[letter] = revealed.get(letter, 0) + 1
+                continue
+
+            # Non-green: the solution does not have this letter here
+            self.allowed[i] &= ~bit
+            if digit == YELLOW:
+                if letter in capped:
+                    # Yellows are handed out left to right, never after a gray
+                    self.satisfiable = False
+                revealed[letter] = revealed.get(letter, 0) + 1
+            else:
+                capped.add(letter)
+
+        for letter in set(letters):
+            count = revealed.get(letter, 0)
+            self.min_counts[letter] = max(self.min_counts[letter], count)
+            if letter in capped:
+                self.max_counts[letter] = min(self.max_counts[letter], count)
+
+        if any(lo > hi for lo, hi in zip(self.min_counts, self.max_counts)):
+            self.satisfiable = False
+        if not all(self.allowed):
+            self.satisfiable = False
+
+        return self
+
+    @property
+    def required_mask(self):
+        """26-bit mask of letters the solution must contain."""
+        return sum(1 << letter for letter, lo in enumerate(self.min_counts) if lo > 0)
+
+    @property
+    def excluded_mask(self):
+        """26-bit mask of letters the solution cannot contain."""
+        return sum(1 << letter for letter, hi in enumerate(self.max_counts) if hi == 0)
+
+
+def hard_mode_constraints(hard_mode):
+    """
+    Empty Constraints for restricting guesses in a hard mode, or None if off.
+
+    hard_mode is 'strict', 'nyt', True (same as 'strict') or a false value.
+    """
+    if not hard_mode:
+        return None
+    if hard_mode is True:
+        hard_mode = 'strict'
+    if hard_mode not in HARD_MODES:
+        raise ValueError(f"Unknown hard mode '{hard_mode}' (choose from {', '.join(HARD_MODES)})")
+    return Constraints(hints_only=hard_mode == 'nyt')
+
+
+class ConstraintIndex:
+    """Precomputed letter bitsets and counts for a fixed word list."""
+
+    def __init__(self, words):
+        self.words = list(words)
+        letters = encode_words(self.words)
+
+        # One-hot letter bit at each position, shape (N, 5)
+        self.position_bits = np.left_shift(np.uint32(1), letters.astype(np.uint32))
+        # 26-bit letter-presence mask per word
+        self.presence = np.bitwise_or.reduce(self.position_bits, axis=1)
+        # Per-letter counts, shape (N, 26)
+        self.counts = np.zeros((len(self.words), NUM_LETTERS), dtype=np.uint8)
+        for i in range(WORD_LENGTH):
+            np.add.at(self.counts, (np.arange(len(self.words)), letters[:, i]), 1)
+
+    def __len__(self):
+        return len(self.words)
+
+    def mask(self, constraints, subset=None):
+        """
+        Boolean mask of words satisfying the constraints.
+
+        If subset (an index array) is given, only those words are tested and
+        the mask is aligned with subset.
+        """
+        rows = slice(None) if subset is None else subset
+        size = len(self.words) if subset is None else len(subset)
+        if not constraints.satisfiable:
+            return np.zeros(size, dtype=bool)
+
+        presence = self.presence[rows]
+        required = np.uint32(constraints.required_mask)
+        excluded = np.uint32(constraints.excluded_mask)
+        keep = ((presence & required) == required) & ((presence & excluded) == 0)
+
+        position_bits = self.position_bits[rows]
+        for i, allowed in enumerate(constraints.allowed):
+            if allowed != ALL_LETTERS:
+                keep &= (position_bits[:, i] & np.uint32(allowed)) != 0
+
+        # Exact counts only matter for repeated letters and capped letters
+        for letter, (lo, hi) in enumerate(zip(constraints.min_counts, constraints.max_counts)):
+            if lo > 1:
+                keep &= self.counts[rows, letter] >= lo
+            if 0 < hi < WORD_LENGTH:
+                keep &= self.counts[rows, letter] <= hi
+
+        return keep
+
+    def filter(self, constraints, subset=None):
+        """Index array of words satisfying the constraints (optionally within subset)."""
+        keep = self.mask(constraints, subset)
+        if subset is None:
+            return np.flatnonzero(keep)
+        return np.asarray(subset)[keep]
+
+    def filter_words(self, constraints, subset=None):
+        """List of words satisfying the constraints."""
+        return [self.words[i] for i in self.filter(constraints, subset)]
+
+
+def constraint_index(words):
+    """
+    Shared ConstraintIndex for a word list, built on first use.
+
+    The least recently used index is dropped once INDEX_CACHE_SIZE lists
+    are held.
+    """
+    key = tuple(words)
+    index = _indexes.pop(key, None)
+    if index is None:
+        index = ConstraintIndex(key)
+        if len(_indexes) >= INDEX_CACHE_SIZE:
+            del _indexes[next(iter(_indexes))]
+    _indexes[key] = index
+    return index
@@ -0,0 +1,307 @@
+"""
+Decision-Tree Wordle Solver
+
+Instead of greedily taking the highest-entropy guess each turn, this builds a
+full decision tree over the solution set that minimizes the expected number
+of guesses, subject to solving every word within MAX_DEPTH (6) guesses.
+
+Search outline:
+- at each node only the top-K guesses by entropy (plus the best candidate
+  guesses) are tried, K shrinking with depth
+- a guess is abandoned as soon as its partial cost plus a lower bound on the
+  remaining buckets cannot beat the best guess found so far
+- results are memoized on a fingerprint of the candidate set and depth
+- once the time budget runs out, remaining nodes are solved greedily
+- in hard mode each node only tries guesses allowed by the feedback on its
+  path (see constraints.hard_mode_constraints)
+
+Feedback comes from the pattern matrix, so it follows generate_feedback
+exactly. The finished tree is plain JSON ({"guess": ..., "children":
+{pattern_code: subtree}}) and a turn is answered by walking it.
+
+Usage:
+    python decision_tree.py [--time-budget SECONDS] [--hard-mode strict|nyt] [--out tree.json]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import time
+
+import numpy as np
+
+from constraints import HARD_MODES, ConstraintIndex, hard_mode_constraints
+from feedback import ALL_GREEN_CODE, as_feedback_code
+from pattern_matrix import load_pattern_matrix
+from ranking import bounded_top_n, entropy_upper_bounds
+from word_store import get_word_store
+
+MAX_DEPTH = 6
+
+# Guesses tried at the root and at deeper nodes
+ROOT_BREADTH = 10
+NODE_BREADTH = 3
+
+# Best candidate (possible-solution) guesses always added to the shortlist
+CANDIDATE_BREADTH = 2
+
+# Candidate sets up to this size are first checked for a candidate that splits them perfectly
+PERFECT_SPLIT_MAX = 64
+
+DEFAULT_TIME_BUDGET = 300.0
+
+
+def lower_bound(size):
+    """Fewest total guesses any strategy can spend on a bucket of this size."""
+    # One word can be guessed immediately; every other needs at least two
+    return 2 * size - 1 if size > 0 else 0
+
+
+class DecisionTree:
+    """A solved decision tree that can be walked turn by turn."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def node_for(self, history):
+        """Node reached after [(guess, feedback), ...], or None if off the tree."""
+        node = self.root
+        for guess, feedback in history:
+            if node is None or node['guess'] != guess:
+                return None
+            node = node['children'].get(str(as_feedback_code(feedback)))
+        return node
+
+    def next_guess(self, history=()):
+        """The tree's guess for the next turn, or None if history left the tree."""
+        node = self.node_for(history)
+        return None if node is None else node['guess']
+
+    def play(self, solution, matrix):
+        """Number of guesses the tree needs for a solution (None if it never gets there)."""
+        node = self.root
+        for turn in range(1, MAX_DEPTH + 1):
+            if node is None:
+                return None
+            guess = node['guess']
+            if guess == solution:
+                return turn
+            code = int(matrix.codes[matrix.guess_index[guess], matrix.solution_index[solution]])
+            node = node['children'].get(str(code))
+        return None
+
+    def to_json(self):
+        return self.root
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_json(json.load(f))
+
+
+class TreeSolver:
+    """Builds a DecisionTree minimizing expected guesses over a solution set."""
+
+    def __init__(self, matrix, allowed_guesses, solutions, max_depth=MAX_DEPTH,
+                 root_breadth=ROOT_BREADTH, breadth=NODE_BREADTH, time_budget=DEFAULT_TIME_BUDGET,
+                 hard_mode=None):
+        self.matrix = matrix
+        self.codes = matrix.codes
+        self.allowed_rows = matrix.guess_indices(allowed_guesses)
+        self.solution_cols = np.sort(matrix.solution_indices(solutions))
+        self.max_depth = max_depth
+        self.root_breadth = root_breadth
+        self.breadth = breadth
+        self.time_budget = time_budget
+
+        # Guess row for each solution column (-1 if that solution is not guessable)
+        self.row_of_col = np.full(len(matrix.solutions), -1, dtype=np.intp)
+        for col, word in enumerate(matrix.solutions):
+            self.row_of_col[col] = matrix.guess_index.get(word, -1)
+
+        # Hard mode: guess constraints per path, tested against an index of the guess words
+        self.hard_constraints = hard_mode_constraints(hard_mode)
+        self.guess_word_index = ConstraintIndex(matrix.guesses) if self.hard_constraints else None
+
+        self.memo = {}
+        self.nodes_evaluated = 0
+        self.memo_hits = 0
+        self.deadline = None
+
+    def solve(self):
+        """Search the tree. Returns (DecisionTree, expected guesses per solution)."""
+        self.deadline = time.monotonic() + self.time_budget
+        cost, root = self._solve(self.solution_cols, 1, self.allowed_rows, self.hard_constraints)
+        if root is None:
+            raise RuntimeError(f"No strategy solves every word within {self.max_depth} guesses")
+        return DecisionTree(root), cost / len(self.solution_cols)
+
+    def _fingerprint(self, cols, depth, pool):
+        digest = hashlib.blake2b(cols.tobytes(), digest_size=16)
+        if self.hard_constraints is not None:
+            # Different paths to the same candidates can allow different guesses
+            digest.update(pool.tobytes())
+        return digest.digest(), depth
+
+    def _child_pool(self, pool, constraints, row, code):
+        """Guess pool and constraints after playing row and seeing code (hard mode)."""
+        if constraints is None:
+            return pool, None
+        constraints = constraints.copy().add(self.matrix.guesses[row], code)
+        return self.guess_word_index.filter(constraints, pool), constraints
+
+    def _shortlist(self, cols, depth, pool):
+        """Guess rows worth trying for this candidate set, most promising first."""
+        out_of_time = time.monotonic() > self.deadline
+        breadth = 1 if out_of_time else (self.root_breadth if depth == 1 else self.breadth)
+
+        candidate_rows = self.row_of_col[cols]
+        candidate_rows = candidate_rows[candidate_rows >= 0]
+
+        # Candidates are listed first so they win entropy ties
+        rows = np.concatenate([candidate_rows, np.setdiff1d(pool, candidate_rows)])
+        bounds = entropy_upper_bounds(self.matrix.guess_letters[rows], self.matrix.solution_letters[cols])
+        positions, _, _ = bounded_top_n(self.codes, rows, cols, bounds, breadth)
+        shortlist = list(rows[positions])
+
+        if not out_of_time and len(candidate_rows):
+            candidate_bounds = bounds[:len(candidate_rows)]
+            positions, _, _ = bounded_top_n(self.codes, candidate_rows, cols, candidate_bounds, CANDIDATE_BREADTH)
+            for i in positions:
+                if candidate_rows[i] not in shortlist:
+                    shortlist.append(candidate_rows[i])
+
+        return shortlist
+
+    def _perfect_split(self, cols):
+        """Node for a candidate guess giving every other candidate its own pattern, if any."""
+        if len(cols) > PERFECT_SPLIT_MAX:
+            return None
+        candidate_rows = self.row_of_col[cols]
+        if (candidate_rows < 0).any():
+            return None
+
+        block = self.codes[np.ix_(candidate_rows, cols)]
+        for row, codes in zip(candidate_rows, block):
+            if len(np.unique(codes)) == len(cols):
+                children = {
+                    str(int(code)): {'guess': self.matrix.solutions[col], 'children': {}}
+                    for code, col in zip(codes, cols)
+                    if code != ALL_GREEN_CODE
+                }
+                return {'guess': self.matrix.guesses[row], 'children': children}
+        return None
+
+    def _solve(self, cols, depth, pool, constraints):
+        """Return (total guesses over all cols, node) or (inf, None) if infeasible."""
+        size = len(cols)
+        if depth > self.max_depth:
+            return math.inf, None
+        if size == 1 and self.row_of_col[cols[0]] >= 0:
+            return 1, {'guess': self.matrix.solutions[cols[0]], 'children': {}}
+
+        key = self._fingerprint(cols, depth, pool)
+        if key in self.memo:
+            self.memo_hits += 1
+            return self.memo[key]
+
+        best_cost, best_node = math.inf, None
+        floor = lower_bound(size)
+
+        # A candidate that separates every other candidate already hits the bound
+        perfect = self._perfect_split(cols) if depth < self.max_depth else None
+        if perfect is not None:
+            self.memo[key] = (floor, perfect)
+            return floor, perfect
+
+        for row in self._shortlist(cols, depth, pool):
+            self.nodes_evaluated += 1
+            codes = self.codes[row, cols]
+            order = np.argsort(codes, kind='stable')
+            sorted_codes = codes[order]
+            bucket_codes, starts = np.unique(sorted_codes, return_index=True)
+            if len(bucket_codes) == 1 and bucket_codes[0] != ALL_GREEN_CODE:
+                continue  # guess tells us nothing
+
+            # Stable sort keeps each bucket's columns in ascending order
+            buckets = [
+                (int(code), cols[order[start:end]])
+                for code, start, end in zip(bucket_codes, starts, list(starts[1:]) + [size])
+                if code != ALL_GREEN_CODE
+            ]
+
+            # Every solution spends this guess; remaining buckets cost at least their bound
+            bound = size + sum(lower_bound(len(bucket)) for _, bucket in buckets)
+            if bound >= best_cost:
+                continue
+
+            cost = size
+            remaining_bound = bound - size
+            children = {}
+            for code, bucket in buckets:
+                remaining_bound -= lower_bound(len(bucket))
+                child_pool, child_constraints = self._child_pool(pool, constraints, row, code)
+                child_cost, child = self._solve(bucket, depth + 1, child_pool, child_constraints)
+                cost += child_cost
+                if child is None or cost + remaining_bound >= best_cost:
+                    break
+                children[str(code)] = child
+            else:
+                best_cost = cost
+                best_node = {'guess': self.matrix.guesses[row], 'children': children}
+                if best_cost == floor:
+                    break  # cannot do better than the lower bound
+
+        self.memo[key] = (best_cost, best_node)
+        return best_cost, best_node
+
+
+def evaluate_tree(tree, matrix, solutions):
+    """Average and max guesses (and failures) when the tree plays every solution."""
+    results = [tree.play(solution, matrix) for solution in solutions]
+    solved = [r for r in results if r is not None]
+    return {
+        'solutions': len(solutions),
+        'average': sum(solved) / len(solved) if solved else None,
+        'max': max(solved) if solved else None,
+        'failures': len(results) - len(solved),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a Wordle decision tree over the NYT solutions")
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET, help="search budget in seconds")
+    parser.add_argument('--root-breadth', type=int, default=ROOT_BREADTH)
+    parser.add_argument('--breadth', type=int, default=NODE_BREADTH)
+    parser.add_argument('--hard-mode', choices=HARD_MODES, help="only try guesses allowed in this hard mode")
+    parser.add_argument('--out', default='decision_tree.json', help="where to write the tree")
+    args = parser.parse_args()
+
+    store = get_word_store()
+    solutions = store.nyt_words()
+    allowed_guesses = sorted(set(store.all_words()) | set(solutions))
+    print(f"Solving {len(solutions)} NYT solutions with {len(allowed_guesses)} allowed guesses")
+
+    matrix = load_pattern_matrix(allowed_guesses, solutions)
+    solver = TreeSolver(matrix, allowed_guesses, solutions, root_breadth=args.root_breadth,
+                        breadth=args.breadth, time_budget=args.time_budget, hard_mode=args.hard_mode)
+
+    start = time.monotonic()
+    tree, expected = solver.solve()
+    elapsed = time.monotonic() - start
+    tree.save(args.out)
+
+    report = evaluate_tree(tree, matrix, solutions)
+    print(f"Opener: {tree.next_guess().upper()}")
+    print(f"Average guesses: {report['average']:.4f}  Max: {report['max']}  Failures: {report['failures']}")
+    print(f"Searched {solver.nodes_evaluated} guesses ({solver.memo_hits} memo hits) in {elapsed:.1f}s")
+    print(f"Tree written to {args.out}")
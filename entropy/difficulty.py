@@ -0,0 +1,194 @@
+"""
+Solution Difficulty Index
+
+Estimates how hard each solution word actually is to solve, as opposed to
+how rare it is (the frequency-based `score`): the number of guesses the
+max-entropy strategy (simulate.py) needs for it, averaged over several
+common openers.
+
+The strategy is deterministic, so instead of replaying one game per
+(opener, solution) the solver's decision tree is expanded once per opener:
+each node picks its guess once and splits its candidates by feedback, and
+every solution's depth in the tree is its guess count. The subtrees under
+each opener's first feedback are spread over a process pool, every worker
+memory-mapping the same precomputed pattern matrix; subtrees reached from
+different openers with the same candidate set are reused.
+
+The output CSV has one row per solution: difficulty (mean guesses across
+the openers), the best and worst opener's guess count, the share of
+openers that need more than six guesses, and difficulty_score - difficulty
+rescaled to the 1.0 - 10.0 range of `score` so the backend can blend the
+two (e.g. 0.7 * score + 0.3 * difficulty_score).
+
+Usage:
+    python difficulty.py --workers 8
+    python difficulty.py --solutions nyt --openers salet crane --out nyt_difficulty.csv
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from feedback import ALL_GREEN_CODE
+from pattern_matrix import load_pattern_matrix
+from simulate import MAX_TURNS, Simulator, max_entropy
+from word_store import get_word_store
+
+DEFAULT_OPENERS = ('salet', 'crane', 'slate', 'trace', 'soare', 'raise', 'adieu', 'arise')
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / 'difficulty.csv'
+
+# Give up on a branch that is still unsolved after this many guesses
+MAX_DEPTH = 20
+
+
+def solve_depths(sim, cols, cache, depth=1):
+    """
+    Guess counts for every solution column in cols, counted from the next guess.
+
+    Expands the max-entropy decision tree below this candidate set; depth
+    (the guess number of the next guess) only bounds the expansion. cache
+    maps a candidate set to its result. Returns {column: guesses}.
+    """
+    key = cols.tobytes()
+    depths = cache.get(key)
+    if depths is not None:
+        return depths
+
+    depths = {}
+    if len(cols) == 1 and sim.row_of_col[cols[0]] >= 0:
+        depths[int(cols[0])] = 1
+    else:
+        row = max_entropy(sim, cols, ())
+        codes = sim.codes[row, cols]
+        for code in np.unique(codes):
+            branch = cols[codes == code]
+            if code == ALL_GREEN_CODE:
+                depths[int(branch[0])] = 1
+            elif len(branch) == len(cols) or depth >= MAX_DEPTH:
+                # The guess told us nothing (or we are lost): count as unsolved
+                depths.update((int(col), MAX_DEPTH) for col in branch)
+            else:
+                for col, guesses in solve_depths(sim, branch, cache, depth + 1).items():
+                    depths[col] = guesses + 1
+    cache[key] = depths
+    return depths
+
+
+# Per-worker simulator and subtree cache set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(allowed_guesses, solutions):
+    matrix = load_pattern_matrix(allowed_guesses, solutions, build=False)
+    _worker['sim'] = Simulator(matrix, allowed_guesses, solutions, 'max-entropy')
+    _worker['cache'] = {}
+
+
+def _solve_branch(task):
+    """Guess counts for the solutions that give code to the opener at row."""
+    opener, row, code = task
+    sim = _worker['sim']
+    cols = sim.solution_cols[sim.codes[row, sim.solution_cols] == code]
+    if code == ALL_GREEN_CODE:
+        return opener, {int(cols[0]): 1}
+    depths = solve_depths(sim, cols, _worker['cache'], depth=2)
+    return opener, {col: guesses + 1 for col, guesses in depths.items()}
+
+
+def opener_tasks(matrix, solutions, openers):
+    """(opener, row, first feedback code) per branch, largest branches first."""
+    solution_cols = matrix.solution_indices(solutions)
+    tasks = []
+    for opener in openers:
+        if opener not in matrix.guess_index:
+            raise ValueError(f"Opener '{opener}' is not an allowed guess")
+        row = matrix.guess_index[opener]
+        codes, sizes = np.unique(matrix.codes[row, solution_cols], return_counts=True)
+        tasks.extend((size, opener, row, int(code)) for code, size in zip(codes, sizes))
+    tasks.sort(key=lambda task: -task[0])
+    return [task[1:] for task in tasks]
+
+
+def compute_difficulty(allowed_guesses, solutions, openers=DEFAULT_OPENERS, workers=1):
+    """
+    Guess counts per (opener, solution) under the max-entropy strategy.
+
+    Returns a (len(openers), len(solutions)) int array in the order of
+    openers and solutions.
+    """
+    matrix = load_pattern_matrix(allowed_guesses, solutions)
+    tasks = opener_tasks(matrix, solutions, openers)
+
+    if workers <= 1:
+        _init_worker(allowed_guesses, solutions)
+        results = [_solve_branch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(allowed_guesses, solutions)) as pool:
+            results = list(pool.map(_solve_branch, tasks))
+
+    column_position = {col: i for i, col in enumerate(matrix.solution_indices(solutions))}
+    opener_position = {opener: i for i, opener in enumerate(openers)}
+    guesses = np.zeros((len(openers), len(solutions)), dtype=np.int64)
+    for opener, depths in results:
+        for col, count in depths.items():
+            guesses[opener_position[opener], column_position[col]] = count
+    return guesses
+
+
+def difficulty_scores(difficulty):
+    """Difficulty rescaled to score's 1.0 (easiest) - 10.0 (hardest), one decimal."""
+    low, high = difficulty.min(), difficulty.max()
+    if high == low:
+        return np.full(len(difficulty), 5.5)
+    return np.round(1 + (difficulty - low) / (high - low) * 9, 1)
+
+
+def write_difficulty_csv(path, solutions, guesses, store):
+    """Write one difficulty row per solution, hardest first."""
+    difficulty = guesses.mean(axis=0)
+    failure_rate = (guesses > MAX_TURNS).mean(axis=0)
+    scaled = difficulty_scores(difficulty)
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'difficulty', 'best_guesses', 'worst_guesses', 'failure_rate',
+                         'difficulty_score', 'score'])
+        for i in np.argsort(-difficulty, kind='stable'):
+            score = store.score(solutions[i])
+            writer.writerow([
+                solutions[i].upper(), f"{difficulty[i]:.4f}", int(guesses[:, i].min()),
+                int(guesses[:, i].max()), f"{failure_rate[i]:.4f}", f"{scaled[i]:.1f}",
+                '' if score is None else f"{score:.1f}",
+            ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate each solution's difficulty from solver simulations")
+    parser.add_argument('--solutions', choices=['frequent', 'nyt'], default='frequent',
+                        help="words with frequency >= 20, or the nyt_words list")
+    parser.add_argument('--openers', nargs='+', default=list(DEFAULT_OPENERS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--out', default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    store = get_word_store()
+    solutions = store.nyt_words() if args.solutions == 'nyt' else store.solution_words()
+    allowed_guesses = sorted(set(store.all_words()) | set(solutions))
+    openers = [opener.lower() for opener in args.openers]
+
+    start = time.perf_counter()
+    guesses = compute_difficulty(allowed_guesses, solutions, openers, args.workers)
+    elapsed = time.perf_counter() - start
+
+    write_difficulty_csv(args.out, solutions, guesses, store)
+    print(f"{len(solutions)} solutions x {len(openers)} openers in {elapsed:.1f}s")
+    for opener, row in zip(openers, guesses):
+        print(f"  {opener.upper()}: {row.mean():.4f} average guesses, {(row > MAX_TURNS).sum()} over {MAX_TURNS}")
+    print(f"Difficulty written to {args.out}")
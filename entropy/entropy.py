@@ -9,45 +9,56 @@ High entropy = more information gained = better guess
 """
 
 import itertools
-from collections import Counter
 import math
-import mysql.connector
-import os
-from pathlib import Path
-from dotenv import load_dotenv
-
-# Load .env from project root
-env_path = Path(__file__).resolve().parent.parent / '.env'
-load_dotenv(env_path)
+import numpy as np
+
+from feedback import (
+    NUM_PATTERNS,
+    feedback_code,
+    as_feedback_code,
+)
+from pattern_matrix import load_pattern_matrix, ensure_pattern_matrix
+from constraints import Constraints, constraint_index, hard_mode_constraints
+from ranking import batch_weighted_entropies, expected_guesses, top_n_indices
+from priors import word_priors, distribution_entropy
+from parallel_ranking import parallel_rank_guesses
+from ranking_cache import get_ranking_cache, ranking_key
+from word_store import get_connection_pool, get_word_store
+from instrumentation import count, span, timed
 
 
 def get_db_connection():
-    """Create a database connection using environment variables."""
-    return mysql.connector.connect(
-        host=os.getenv('DB_HOST', 'localhost'),
-        user=os.getenv('DB_USER', 'root'),
-        password=os.getenv('DB_PASSWORD', ''),
-        database=os.getenv('DB_NAME', 'wordleapp')
-    )
+    """Get a database connection from the shared pool (close() returns it)."""
+    return get_connection_pool().get_connection()
 
 
-def compute_entropy(candidate_list, word):
+@timed('compute_entropy')
+def compute_entropy(candidate_list, word, matrix=None):
     """
     Compute the entropy of a guess word against a list of possible solutions.
 
     Entropy measures how much information a guess provides on average.
     Higher entropy = guess splits candidates more evenly = more information.
+
+    If a PatternMatrix covering the words is given, feedback is read from it
+    instead of being recomputed.
     """
-    pattern_counts = Counter()
+    count('feedback_evaluations', len(candidate_list))
+    if matrix is not None:
+        pattern_counts = np.bincount(matrix.row(word, candidate_list), minlength=NUM_PATTERNS)
+    else:
+        pattern_counts = [0] * NUM_PATTERNS
+
+        # Simulate feedback for each possible solution (as compact pattern codes)
+        for solution in candidate_list:
+            pattern_counts[feedback_code(word, solution)] += 1
 
-    # Simulate feedback for each possible solution
-    for solution in candidate_list:
-        feedback = generate_feedback(word, solution)
-        pattern_counts[feedback] += 1
+    return entropy_from_counts(pattern_counts, len(candidate_list))
 
-    # Compute probabilities and entropy
-    total_candidates = len(candidate_list)
-    probabilities = [count / total_candidates for count in pattern_counts.values()]
+
+def entropy_from_counts(pattern_counts, total_candidates):
+    """Entropy in bits of a 243-slot pattern count array."""
+    probabilities = [int(count) / total_candidates for count in pattern_counts if count]
     entropy = -sum(p * math.log2(p) for p in probabilities if p > 0)
 
     return entropy
@@ -59,6 +70,7 @@ def generate_feedback(guess, solution):
 
     Returns tuple of ("Green", "Yellow", "Gray") for each position.
     """
+    count('feedback_evaluations')
     feedback = []
     solution_chars = list(solution)
 
@@ -82,74 +94,236 @@ def generate_feedback(guess, solution):
     return tuple(feedback)
 
 
-def get_top_entropy_words(candidate_list, n=10):
+def get_best_guesses(allowed_guesses, possible_solutions, n=10, matrix=None,
+                     prefer_candidates=True, worst=False, workers=None):
+    """
+    Rank every allowed guess by entropy against the possible solutions.
+
+    The guess pool is independent of the solution pool, so a non-candidate
+    probe word that splits the remaining solutions best can be suggested.
+
+    Args:
+        allowed_guesses: Words that may be guessed (e.g. the full words table)
+        possible_solutions: Words that may still be the answer
+        n: Number of results to return
+        matrix: Optional PatternMatrix covering both lists
+        prefer_candidates: On equal entropy, rank possible solutions first
+        worst: Rank lowest entropy first instead of highest
+        workers: Process count for parallel ranking (see parallel_ranking.py)
+
+    Rankings are memoized in the shared ranking cache (see ranking_cache.py).
+
+    Returns:
+        List of (word, entropy) tuples, best first (worst first if worst=True)
+    """
+    with span('rank'):
+        key = ranking_key(allowed_guesses, possible_solutions,
+                          prefer_candidates=prefer_candidates, worst=worst)
+        return get_ranking_cache().cached(key, n, lambda: _rank_guesses(
+            allowed_guesses, possible_solutions, n, matrix, prefer_candidates, worst, workers
+        ))
+
+
+def _rank_guesses(allowed_guesses, possible_solutions, n, matrix, prefer_candidates, worst, workers):
+    """Uncached body of get_best_guesses."""
+    if prefer_candidates:
+        # Ties keep guess order, so listing candidates first prefers them
+        solution_set = set(possible_solutions)
+        allowed_guesses = (
+            [word for word in allowed_guesses if word in solution_set]
+            + [word for word in allowed_guesses if word not in solution_set]
+        )
+
+    matrix = ensure_pattern_matrix(allowed_guesses, possible_solutions, matrix)
+    positions, entropies = parallel_rank_guesses(
+        matrix,
+        matrix.guess_indices(allowed_guesses),
+        matrix.solution_indices(possible_solutions),
+        n,
+        worst=worst,
+        workers=workers,
+    )
+    return [(allowed_guesses[i], float(e)) for i, e in zip(positions, entropies)]
+
+
+def get_weighted_guesses(allowed_guesses, possible_solutions, n=10, matrix=None,
+                         weights=None, objective='expected-score'):
+    """
+    Rank allowed guesses using a frequency prior over the possible solutions.
+
+    Args:
+        allowed_guesses: Words that may be guessed
+        possible_solutions: Words that may still be the answer
+        n: Number of results to return
+        matrix: Optional PatternMatrix covering both lists
+        weights: Prior weight per possible solution (default: priors.word_priors)
+        objective: 'entropy' ranks by weighted entropy (highest first);
+            'expected-score' ranks by expected total guesses, combining the
+            chance of winning outright with the information gained (lowest first)
+
+    Returns:
+        List of (word, value) tuples, best first
+    """
+    if objective not in ('entropy', 'expected-score'):
+        raise ValueError(f"Unknown objective '{objective}'")
+
+    weights = word_priors(possible_solutions) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    # Candidates first so they win ties, as in get_best_guesses
+    solution_set = set(possible_solutions)
+    allowed_guesses = (
+        [word for word in allowed_guesses if word in solution_set]
+        + [word for word in allowed_guesses if word not in solution_set]
+    )
+
+    matrix = ensure_pattern_matrix(allowed_guesses, possible_solutions, matrix)
+    entropies = batch_weighted_entropies(
+        matrix.codes,
+        matrix.guess_indices(allowed_guesses),
+        matrix.solution_indices(possible_solutions),
+        weights,
+    )
+
+    if objective == 'entropy':
+        values = entropies
+        positions = top_n_indices(values, n)
+    else:
+        probability = dict(zip(possible_solutions, weights / weights.sum()))
+        win_probabilities = np.array([probability.get(word, 0.0) for word in allowed_guesses])
+        values = expected_guesses(entropies, win_probabilities, distribution_entropy(weights))
+        positions = top_n_indices(values, n, largest=False)
+
+    return [(allowed_guesses[i], float(values[i])) for i in positions]
+
+
+def rank_candidates(candidate_list, n=10, matrix=None, worst=False, workers=None):
+    """
+    Rank candidates by entropy with the vectorized engine (see ranking.py).
+
+    With workers > 1 (or ENTROPY_WORKERS set) the guesses are split across
+    a process pool (see parallel_ranking.py).
+
+    Returns list of (word, entropy) tuples, best first (worst first if worst=True).
+    """
+    return get_best_guesses(
+        candidate_list, candidate_list, n, matrix,
+        prefer_candidates=False, worst=worst, workers=workers,
+    )
+
+
+def get_top_entropy_words(candidate_list, n=10, matrix=None, workers=None):
     """
     Compute entropy for all candidates and return top N by entropy.
 
     Returns list of (word, entropy) tuples sorted by entropy descending.
     """
-    word_entropies = {
-        word: compute_entropy(candidate_list, word)
-        for word in candidate_list
-    }
-    sorted_words = sorted(word_entropies.items(), key=lambda x: x[1], reverse=True)
-    return sorted_words[:n]
+    return rank_candidates(candidate_list, n, matrix, workers=workers)
+
 
+def hard_mode_guesses(allowed_guesses, history, hard_mode='strict', index=None):
+    """
+    Allowed guesses that may still be played in hard mode.
+
+    Args:
+        allowed_guesses: Words that may be guessed
+        history: [(guess, feedback), ...] so far
+        hard_mode: 'strict' (consistent with all feedback) or 'nyt'
+            (greens kept in place, revealed letters reused)
+        index: Optional ConstraintIndex of allowed_guesses (default: the
+            shared one from constraints.constraint_index, reused every turn)
+    """
+    constraints = hard_mode_constraints(hard_mode)
+    if constraints is None:
+        return list(allowed_guesses)
+    for guess, feedback in history:
+        constraints.add(guess, feedback)
+    if index is None:
+        index = constraint_index(allowed_guesses)
+    return index.filter_words(constraints)
+
+
+def choose_next_guess(candidate_list, matrix=None, workers=None, allowed_guesses=None,
+                      hard_mode=None, history=()):
+    """
+    Choose the word with the highest entropy (best next guess).
 
-def choose_next_guess(candidate_list):
-    """Choose the word with the highest entropy (best next guess)."""
-    word_entropies = {
-        word: compute_entropy(candidate_list, word)
-        for word in candidate_list
-    }
-    return max(word_entropies, key=word_entropies.get)
+    If allowed_guesses is given, any of those words may be chosen (candidates
+    win ties); otherwise only candidates are considered. With hard_mode set,
+    the allowed guesses are first restricted by the feedback in history
+    (see hard_mode_guesses).
+    """
+    if hard_mode and allowed_guesses is not None:
+        allowed_guesses = hard_mode_guesses(allowed_guesses, history, hard_mode)
+    if allowed_guesses is not None:
+        return get_best_guesses(allowed_guesses, candidate_list, 1, matrix, workers=workers)[0][0]
+    return rank_candidates(candidate_list, 1, matrix, workers=workers)[0][0]
 
 
 def fetch_words_from_db(query, params=None):
     """Execute a query and return list of words."""
-    connection = get_db_connection()
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, params or ())
-        words = [row[0] for row in cursor.fetchall()]
-    finally:
-        cursor.close()
-        connection.close()
+    count('db_queries')
+    with span('db'):
+        connection = get_db_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute(query, params or ())
+            words = [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            connection.close()
 
     return words
 
 
 def fetch_all_valid_words():
-    """Fetch all 5-letter words with frequency >= 20 (same as game uses)."""
-    query = "SELECT LOWER(word) FROM words WHERE frequency >= 20"
-    return fetch_words_from_db(query)
+    """
+    Fetch all 5-letter words with frequency >= 20 (same as game uses).
+
+    Read from the configured word store (CSV snapshot by default, see word_store.py).
+    """
+    return get_word_store().solution_words()
 
 
-def filter_candidates(candidates, guess, feedback):
+def fetch_all_words():
+    """Fetch every word in the words table (any frequency - all valid guesses)."""
+    return get_word_store().all_words()
+
+
+@timed('filter')
+def filter_candidates(candidates, guess, feedback, matrix=None, index=None):
     """
     Filter candidate words based on feedback from a guess.
 
     Args:
         candidates: List of possible words
         guess: The guessed word
-        feedback: Tuple of ("Green", "Yellow", "Gray") for each position
+        feedback: Tuple of ("Green", "Yellow", "Gray") for each position,
+            or the equivalent pattern code from feedback.encode_feedback
+        matrix: Optional PatternMatrix to read feedback from
+        index: Optional ConstraintIndex of candidates (default: the shared
+            one from constraints.constraint_index)
 
     Returns:
         Filtered list of candidates that match the feedback
     """
-    filtered = []
+    if matrix is not None:
+        keep = matrix.row(guess, candidates) == as_feedback_code(feedback)
+        return [candidate for candidate, kept in zip(candidates, keep) if kept]
 
-    for candidate in candidates:
-        if matches_feedback(candidate, guess, feedback):
-            filtered.append(candidate)
-
-    return filtered
+    # Fold the feedback into letter constraints and filter with bitwise ops
+    if index is None:
+        index = constraint_index(candidates)
+    return index.filter_words(Constraints().add(guess, feedback))
 
 
 def matches_feedback(candidate, guess, feedback):
-    """Check if a candidate word would produce the given feedback for a guess."""
-    return generate_feedback(guess, candidate) == feedback
+    """
+    Check if a candidate word would produce the given feedback for a guess.
+
+    Feedback may be a tuple of ("Green", "Yellow", "Gray") or a pattern code.
+    """
+    return feedback_code(guess, candidate) == as_feedback_code(feedback)
 
 
 # Example usage when run directly
@@ -158,8 +332,11 @@ if __name__ == "__main__":
     all_words = fetch_all_valid_words()
     print(f"Loaded {len(all_words)} valid words")
 
+    # Precomputed feedback for every word pair (built once, then memory-mapped)
+    matrix = load_pattern_matrix(all_words)
+
     # Get top 10 starting words by entropy
     print("\nTop 10 starting words by entropy:")
-    top_words = get_top_entropy_words(all_words, 10)
+    top_words = get_top_entropy_words(all_words, 10, matrix)
     for word, entropy in top_words:
         print(f"  {word.upper()}: {entropy:.3f} bits")
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Compact Feedback Patterns for Wordle
+
+Encodes a Wordle feedback pattern as a single base-3 integer instead of a
+tuple of strings. Each position contributes one ternary digit:
+
+    Gray = 0, Yellow = 1, Green = 2
+
+Position i is weighted by 3**i, so every pattern maps to a code in 0..242
+and all-green is 242. Codes are cheap to hash and can index a fixed
+243-slot array directly, which is what the entropy calculations use.
+"""
+
+import numbers
+
+WORD_LENGTH = 5
+NUM_PATTERNS = 3 ** WORD_LENGTH  # 243
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+FEEDBACK_NAMES = ("Gray", "Yellow", "Green")
+FEEDBACK_DIGITS = {name: digit for digit, name in enumerate(FEEDBACK_NAMES)}
+
+POSITION_WEIGHTS = tuple(3 ** i for i in range(WORD_LENGTH))
+
+ALL_GREEN_CODE = NUM_PATTERNS - 1
+
+
+def feedback_code(guess, solution):
+    """
+    Generate Wordle feedback for a guess against a solution as a pattern code.
+
+    Same greedy duplicate-letter handling as entropy.generate_feedback:
+    greens are taken first, then yellows are handed out left to right
+    while unmatched copies of the letter remain in the solution.
+    """
+    unmatched = [s for g, s in zip(guess, solution) if g != s]
+
+    code = 0
+    for weight, g, s in zip(POSITION_WEIGHTS, guess, solution):
+        if g == s:
+            code += GREEN * weight
+        elif g in unmatched:
+            code += YELLOW * weight
+            unmatched.remove(g)
+
+    return code
+
+
+def encode_feedback(feedback):
+    """Convert a tuple of ("Green", "Yellow", "Gray") into a pattern code."""
+    return sum(
+        FEEDBACK_DIGITS[fb] * weight
+        for fb, weight in zip(feedback, POSITION_WEIGHTS)
+    )
+
+
+def decode_feedback(code):
+    """Convert a pattern code back into a tuple of ("Green", "Yellow", "Gray")."""
+    feedback = []
+    for _ in range(WORD_LENGTH):
+        code, digit = divmod(code, 3)
+        feedback.append(FEEDBACK_NAMES[digit])
+    return tuple(feedback)
+
+
+def as_feedback_tuple(feedback):
+    """Accept either a pattern code or a feedback tuple and return the tuple."""
+    if isinstance(feedback, numbers.Integral):
+        return decode_feedback(feedback)
+    return tuple(feedback)
+
+
+def as_feedback_code(feedback):
+    """Accept either a pattern code or a feedback tuple and return the code."""
+    if isinstance(feedback, numbers.Integral):
+        return int(feedback)
+    return encode_feedback(feedback)
@@ -0,0 +1,146 @@
+"""
+Hot-Path Instrumentation
+
+Timing spans and counters for the stages of a cheater turn: word-store and
+DB reads, candidate filtering, entropy ranking, feedback evaluations and
+ranking-cache hits. Everything is off unless WORDLE_PROFILE is set (or
+enable() is called, e.g. by a --profile flag); when off, span() returns a
+shared no-op context and count() returns immediately.
+
+WORDLE_PROFILE_OUT names a file to write cProfile/pstats output to
+(inspect it with `python -m pstats FILE`).
+
+Usage:
+    with span('filter'):
+        ...
+    count('feedback_evaluations', len(candidates))
+    print(format_report(take_report(), "Turn 2"))
+"""
+
+import contextlib
+import cProfile
+import functools
+import os
+import time
+from collections import defaultdict
+
+_enabled = os.getenv('WORDLE_PROFILE', '') not in ('', '0')
+PROFILE_OUT = os.getenv('WORDLE_PROFILE_OUT') or None
+
+_NULL_SPAN = contextlib.nullcontext()
+
+# name -> [seconds, calls] and name -> total, since the last reset
+_spans = defaultdict(lambda: [0.0, 0])
+_counters = defaultdict(int)
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    """Turn instrumentation on (e.g. from a --profile flag)."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        entry = _spans[self.name]
+        entry[0] += time.perf_counter() - self.start
+        entry[1] += 1
+        return False
+
+
+def span(name):
+    """Context manager timing a stage under name (a no-op when disabled)."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name):
+    """Decorator timing every call of a function as a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, amount=1):
+    """Add amount to a counter (a no-op when disabled)."""
+    if _enabled:
+        _counters[name] += amount
+
+
+def reset():
+    _spans.clear()
+    _counters.clear()
+
+
+def snapshot():
+    """Spans and counters recorded since the last reset."""
+    return {
+        'spans': {name: {'seconds': seconds, 'calls': calls} for name, (seconds, calls) in _spans.items()},
+        'counters': dict(_counters),
+    }
+
+
+def take_report():
+    """snapshot() and reset(), for a per-turn breakdown."""
+    report = snapshot()
+    reset()
+    return report
+
+
+def format_report(report, title="Profile"):
+    """Human-readable breakdown of a snapshot, slowest span first."""
+    lines = [f"{title}:"]
+    spans = sorted(report['spans'].items(), key=lambda item: -item[1]['seconds'])
+    for name, stats in spans:
+        lines.append(f"  {name:<24} {stats['seconds'] * 1000:9.2f} ms  ({stats['calls']} calls)")
+    for name, total in sorted(report['counters'].items()):
+        lines.append(f"  {name:<24} {total:>9}")
+    if len(lines) == 1:
+        lines.append("  (nothing recorded)")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profiling(path=None):
+    """
+    Run the body under cProfile and write pstats output to path.
+
+    path defaults to WORDLE_PROFILE_OUT; with neither set this does nothing.
+    """
+    path = path or PROFILE_OUT
+    if not path:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
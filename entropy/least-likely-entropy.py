@@ -9,33 +9,25 @@ it finds guesses that tell you almost nothing.
 """
 
 from entropy import (
-    compute_entropy,
     fetch_all_valid_words,
     get_top_entropy_words,
+    rank_candidates,
 )
+from pattern_matrix import load_pattern_matrix
 
 
-def get_worst_entropy_words(candidate_list, n=10):
+def get_worst_entropy_words(candidate_list, n=10, matrix=None, workers=None):
     """
     Get the N words with the LOWEST entropy (worst guesses).
 
     Returns list of (word, entropy) tuples sorted by entropy ascending.
     """
-    word_entropies = {
-        word: compute_entropy(candidate_list, word)
-        for word in candidate_list
-    }
-    sorted_words = sorted(word_entropies.items(), key=lambda x: x[1])
-    return sorted_words[:n]
+    return rank_candidates(candidate_list, n, matrix, worst=True, workers=workers)
 
 
-def choose_least_likely_word(candidate_list):
+def choose_least_likely_word(candidate_list, matrix=None, workers=None):
     """Choose the word with the lowest entropy (worst next guess)."""
-    word_entropies = {
-        word: compute_entropy(candidate_list, word)
-        for word in candidate_list
-    }
-    return min(word_entropies, key=word_entropies.get)
+    return rank_candidates(candidate_list, 1, matrix, worst=True, workers=workers)[0][0]
 
 
 if __name__ == "__main__":
@@ -43,14 +35,16 @@ if __name__ == "__main__":
     all_words = fetch_all_valid_words()
     print(f"Loaded {len(all_words)} valid words")
 
+    matrix = load_pattern_matrix(all_words)
+
     # Get worst 10 starting words by entropy
     print("\nTop 10 WORST starting words by entropy:")
-    worst_words = get_worst_entropy_words(all_words, 10)
+    worst_words = get_worst_entropy_words(all_words, 10, matrix)
     for word, entropy in worst_words:
         print(f"  {word.upper()}: {entropy:.3f} bits")
 
     # Compare to best
     print("\nFor comparison, top 10 BEST starting words:")
-    best_words = get_top_entropy_words(all_words, 10)
+    best_words = get_top_entropy_words(all_words, 10, matrix)
     for word, entropy in best_words:
         print(f"  {word.upper()}: {entropy:.3f} bits")
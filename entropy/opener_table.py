@@ -0,0 +1,136 @@
+"""
+Precomputed Opener and Second-Guess Table
+
+For a fixed word list the best opening guess never changes, and neither does
+the best second guess after each of the 243 feedback patterns the opener can
+produce. This module computes both once, saves them as a small JSON file
+keyed by a hash of the word lists, and answers the first two turns of a game
+with a table lookup.
+
+Usage:
+    python opener_table.py          # build the table and print the opener
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from entropy import get_best_guesses, fetch_all_words
+from feedback import as_feedback_code
+from pattern_matrix import (
+    CACHE_DIR,
+    canonical_words,
+    ensure_pattern_matrix,
+    load_pattern_matrix,
+    word_list_hash,
+)
+
+# Bump whenever the table contents or layout change
+TABLE_VERSION = 1
+
+# Suggestions stored per turn
+TABLE_TOP_N = 10
+
+
+class OpenerTable:
+    """Best first guesses and best second guesses per opener feedback pattern."""
+
+    def __init__(self, opener_top, second_top):
+        self.opener_top = opener_top
+        self.second_top = second_top
+
+    @property
+    def opener(self):
+        """The single best opening guess."""
+        return self.opener_top[0][0]
+
+    def lookup(self, history):
+        """
+        Suggestions for the next turn given [(guess, feedback), ...] so far.
+
+        Returns a list of (word, entropy) tuples, or None when the table does
+        not cover the position (past turn 2, or a different opener was played).
+        """
+        if len(history) == 0:
+            return self.opener_top
+        if len(history) == 1:
+            guess, feedback = history[0]
+            if guess == self.opener:
+                return self.second_top.get(as_feedback_code(feedback))
+        return None
+
+    def to_json(self):
+        return {
+            'version': TABLE_VERSION,
+            'opener': [list(entry) for entry in self.opener_top],
+            'second': {str(code): [list(entry) for entry in top] for code, top in self.second_top.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        opener_top = [tuple(entry) for entry in data['opener']]
+        second_top = {int(code): [tuple(entry) for entry in top] for code, top in data['second'].items()}
+        return cls(opener_top, second_top)
+
+
+def build_opener_table(allowed_guesses, solutions, matrix=None, n=TABLE_TOP_N):
+    """Compute the opener ranking and the best second guesses for every opener pattern."""
+    matrix = ensure_pattern_matrix(allowed_guesses, solutions, matrix)
+
+    opener_top = get_best_guesses(allowed_guesses, solutions, n, matrix)
+    opener = opener_top[0][0]
+
+    # Group the solutions by the feedback the opener would get
+    codes = matrix.row(opener, solutions)
+    second_top = {}
+    for code in np.unique(codes):
+        remaining = [word for word, c in zip(solutions, codes) if c == code]
+        second_top[int(code)] = get_best_guesses(allowed_guesses, remaining, n, matrix)
+
+    return OpenerTable(opener_top, second_top)
+
+
+def table_path(allowed_guesses, solutions, cache_dir=CACHE_DIR):
+    """Cache file path for a pair of canonical word lists."""
+    return Path(cache_dir) / f"openers-v{TABLE_VERSION}-{word_list_hash(allowed_guesses, solutions)}.json"
+
+
+def load_opener_table(allowed_guesses, solutions=None, matrix=None, cache_dir=CACHE_DIR, build=True):
+    """
+    Load the opener table for the given word lists.
+
+    Builds and caches it first if no matching file exists and build is True;
+    otherwise returns None when it is missing.
+    """
+    allowed_guesses = canonical_words(allowed_guesses)
+    solutions = allowed_guesses if solutions is None else canonical_words(solutions)
+    path = table_path(allowed_guesses, solutions, cache_dir)
+
+    if path.exists():
+        with open(path, encoding='utf-8') as f:
+            return OpenerTable.from_json(json.load(f))
+
+    if not build:
+        return None
+
+    print("Building opener table (one-time)...")
+    table = build_opener_table(allowed_guesses, solutions, matrix)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table.to_json(), f)
+    os.replace(tmp_path, path)
+
+    return table
+
+
+if __name__ == "__main__":
+    all_words = fetch_all_words()
+    matrix = load_pattern_matrix(all_words)
+    table = load_opener_table(all_words, matrix=matrix)
+
+    print(f"\nBest opener: {table.opener.upper()}")
+    print(f"Second guesses precomputed for {len(table.second_top)} feedback patterns")
@@ -0,0 +1,152 @@
+"""
+Multi-Process Entropy Ranking
+
+Splits the guesses of a ranking across a ProcessPoolExecutor. The pattern
+codes are shared with the workers instead of being pickled per task:
+memory-mapped matrices are reopened from their .npy file, in-memory ones are
+copied once into a multiprocessing.shared_memory block. Each task ranks one
+chunk of guesses and returns its local top N; the parent merges them.
+
+Worker count defaults to the ENTROPY_WORKERS environment variable (1 = serial)
+and guesses per task to ENTROPY_CHUNK_SIZE.
+
+Best-first rankings use the branch-and-bound search in ranking.py: serially
+it usually evaluates only a few hundred guesses; with workers each task runs
+the bounded search over its own chunk (bounds are computed once by the
+parent) and the per-chunk top N are merged the same way.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from instrumentation import count
+from ranking import bounded_top_n, entropy_upper_bounds, rank_guesses
+
+DEFAULT_WORKERS = int(os.getenv('ENTROPY_WORKERS', '1'))
+
+# Guesses ranked per task
+DEFAULT_CHUNK_SIZE = int(os.getenv('ENTROPY_CHUNK_SIZE', '512'))
+
+# Per-worker state set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(codes_spec, guess_idx, solution_idx, n, worst, bounds=None):
+    """Attach to the shared pattern codes once per worker process."""
+    kind = codes_spec[0]
+    if kind == 'file':
+        _, path = codes_spec
+        codes = np.load(path, mmap_mode='r')
+    else:
+        _, name, shape = codes_spec
+        shm = shared_memory.SharedMemory(name=name)
+        codes = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        _worker['shm'] = shm  # keep the mapping alive
+
+    _worker.update(codes=codes, guess_idx=guess_idx, solution_idx=solution_idx, n=n, worst=worst,
+                   bounds=bounds)
+
+
+def _rank_chunk(start, stop):
+    """
+    Rank guess_idx[start:stop]; return its top N as (positions, entropies, evaluated).
+
+    With bounds set (best-first pruning) the chunk is ranked with the
+    bounded search, otherwise every guess in it is evaluated.
+    """
+    guess_idx = _worker['guess_idx'][start:stop]
+    if _worker['bounds'] is not None:
+        positions, entropies, stats = bounded_top_n(
+            _worker['codes'], guess_idx, _worker['solution_idx'],
+            _worker['bounds'][start:stop], _worker['n'],
+        )
+        return positions + start, entropies, stats['evaluated']
+
+    positions, entropies = rank_guesses(
+        _worker['codes'], guess_idx, _worker['solution_idx'], _worker['n'], worst=_worker['worst'],
+    )
+    return positions + start, entropies[positions], len(guess_idx)
+
+
+def _count_evaluated(evaluated, guesses, solutions):
+    count('guesses_evaluated', evaluated)
+    count('guesses_pruned', guesses - evaluated)
+    count('feedback_lookups', evaluated * solutions)
+
+
+def merge_top_n(results, n, worst=False):
+    """Merge per-chunk (positions, entropies, ...) results into one global top N."""
+    positions = np.concatenate([result[0] for result in results])
+    entropies = np.concatenate([result[1] for result in results])
+    keys = entropies if worst else -entropies
+    order = np.lexsort((positions, keys))[:n]
+    return positions[order], entropies[order]
+
+
+def parallel_rank_guesses(matrix, guess_idx, solution_idx, n=10, worst=False,
+                          workers=None, chunk_size=None, prune=True):
+    """
+    Rank guesses by entropy across a process pool.
+
+    Args:
+        matrix: PatternMatrix holding the codes
+        guess_idx: Row indices of the guesses to rank
+        solution_idx: Column indices of the candidate solutions
+        n: Number of results to keep
+        worst: Rank lowest entropy first instead of highest
+        workers: Process count (defaults to ENTROPY_WORKERS)
+        chunk_size: Guesses per task (defaults to ENTROPY_CHUNK_SIZE)
+        prune: Use the branch-and-bound search for best-first rankings
+            (per chunk when parallel; worst-first rankings always
+            evaluate every guess)
+
+    Returns:
+        (positions, entropies) for the top N, positions indexing into guess_idx
+    """
+    workers = workers or DEFAULT_WORKERS
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    guess_idx = np.asarray(guess_idx, dtype=np.intp)
+    solution_idx = np.asarray(solution_idx, dtype=np.intp)
+
+    bounds = None
+    if prune and not worst:
+        bounds = entropy_upper_bounds(matrix.guess_letters[guess_idx], matrix.solution_letters[solution_idx])
+
+    if workers <= 1 or len(guess_idx) <= chunk_size:
+        if bounds is not None:
+            # bounded_top_n counts the guesses it evaluates and prunes itself
+            positions, entropies, stats = bounded_top_n(matrix.codes, guess_idx, solution_idx, bounds, n)
+            count('feedback_lookups', stats['evaluated'] * len(solution_idx))
+            return positions, entropies
+        _count_evaluated(len(guess_idx), len(guess_idx), len(solution_idx))
+        positions, entropies = rank_guesses(matrix.codes, guess_idx, solution_idx, n, worst=worst)
+        return positions, entropies[positions]
+
+    shm = None
+    if matrix.path is not None:
+        codes_spec = ('file', str(matrix.path))
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.codes.nbytes, 1))
+        np.ndarray(matrix.codes.shape, dtype=np.uint8, buffer=shm.buf)[:] = matrix.codes
+        codes_spec = ('shm', shm.name, matrix.codes.shape)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(codes_spec, guess_idx, solution_idx, n, worst, bounds),
+        ) as pool:
+            starts = range(0, len(guess_idx), chunk_size)
+            futures = [pool.submit(_rank_chunk, start, start + chunk_size) for start in starts]
+            results = [future.result() for future in futures]
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    # Worker-side counts stay in the workers; count the whole ranking here
+    _count_evaluated(sum(result[2] for result in results), len(guess_idx), len(solution_idx))
+    return merge_top_n(results, n, worst)
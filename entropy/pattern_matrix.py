@@ -0,0 +1,237 @@
+"""
+Precomputed Guess x Solution Pattern Matrix
+
+Computing feedback for every (guess, solution) pair is the dominant cost of
+every entropy calculation. This module computes the full matrix of pattern
+codes (see feedback.py) once as a uint8 array, saves it as a versioned .npy
+file keyed by a hash of the word lists, and memory-maps it on later runs.
+
+Usage:
+    python pattern_matrix.py          # build the matrices the tools use
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from feedback import GREEN, YELLOW, WORD_LENGTH, POSITION_WEIGHTS
+from instrumentation import timed
+
+# Bump whenever the on-disk layout or the pattern encoding changes
+FORMAT_VERSION = 1
+
+CACHE_DIR = Path(__file__).resolve().parent / '.cache'
+
+# Guess rows processed per vectorized block (bounds peak memory while building)
+BUILD_CHUNK_SIZE = 512
+
+
+def encode_words(words):
+    """Convert a list of 5-letter words into an (N, 5) uint8 array of letter indices 0-25."""
+    joined = "".join(words).lower().encode('ascii')
+    letters = np.frombuffer(joined, dtype=np.uint8) - ord('a')
+    return letters.reshape(len(words), WORD_LENGTH)
+
+
+def _pattern_codes_block(guess_letters, solution_letters):
+    """
+    Vectorized feedback for a block of guesses against every solution.
+
+    Reproduces the greedy duplicate-letter rule of generate_feedback: a
+    non-green guess letter is yellow when fewer earlier non-green copies of
+    that letter exist in the guess than unmatched copies in the solution.
+    """
+    shape = (len(guess_letters), len(solution_letters))
+    green = [
+        guess_letters[:, i, None] == solution_letters[None, :, i]
+        for i in range(WORD_LENGTH)
+    ]
+
+    codes = np.zeros(shape, dtype=np.uint8)
+    for i, weight in enumerate(POSITION_WEIGHTS):
+        letter = guess_letters[:, i, None]
+
+        # Unmatched copies of this guess letter left in the solution
+        available = np.zeros(shape, dtype=np.uint8)
+        for k in range(WORD_LENGTH):
+            available += (letter == solution_letters[None, :, k]) & ~green[k]
+
+        # Earlier non-green positions holding the same guess letter
+        earlier = np.zeros(shape, dtype=np.uint8)
+        for j in range(i):
+            earlier += (guess_letters[:, j] == guess_letters[:, i])[:, None] & ~green[j]
+
+        yellow = ~green[i] & (earlier < available)
+        codes += green[i] * np.uint8(GREEN * weight) + yellow * np.uint8(YELLOW * weight)
+
+    return codes
+
+
+def compute_pattern_codes(guesses, solutions, chunk_size=BUILD_CHUNK_SIZE):
+    """
+    Compute the pattern code for every (guess, solution) pair.
+
+    Returns a (len(guesses), len(solutions)) uint8 array.
+    """
+    guess_letters = encode_words(guesses)
+    solution_letters = encode_words(solutions)
+
+    codes = np.empty((len(guesses), len(solutions)), dtype=np.uint8)
+    for start in range(0, len(guesses), chunk_size):
+        stop = start + chunk_size
+        codes[start:stop] = _pattern_codes_block(guess_letters[start:stop], solution_letters)
+
+    return codes
+
+
+def word_list_hash(guesses, solutions):
+    """Stable hash of the (sorted) guess and solution lists plus the format version."""
+    digest = hashlib.sha1(f"v{FORMAT_VERSION}".encode())
+    digest.update("\n".join(guesses).encode())
+    digest.update(b"|")
+    digest.update("\n".join(solutions).encode())
+    return digest.hexdigest()[:16]
+
+
+def canonical_words(words):
+    """Lowercased, de-duplicated and sorted copy of a word list (the cache key order)."""
+    return sorted({word.lower() for word in words})
+
+
+class PatternMatrix:
+    """
+    Feedback codes for every (guess, solution) pair of two word lists.
+
+    Word lists are stored sorted and de-duplicated; use guess_indices /
+    solution_indices to translate words into row and column positions.
+    """
+
+    def __init__(self, guesses, solutions, codes, path=None):
+        self.guesses = guesses
+        self.solutions = solutions
+        self.codes = codes
+        self.path = path
+        self.guess_index = {word: i for i, word in enumerate(guesses)}
+        self.solution_index = {word: i for i, word in enumerate(solutions)}
+        self._guess_letters = None
+        self._solution_letters = None
+
+    def __repr__(self):
+        return f"PatternMatrix({len(self.guesses)} guesses x {len(self.solutions)} solutions)"
+
+    @property
+    def guess_letters(self):
+        """(G, 5) letter indices of the guesses (see encode_words)."""
+        if self._guess_letters is None:
+            self._guess_letters = encode_words(self.guesses)
+        return self._guess_letters
+
+    @property
+    def solution_letters(self):
+        """(S, 5) letter indices of the solutions."""
+        if self._solution_letters is None:
+            self._solution_letters = encode_words(self.solutions)
+        return self._solution_letters
+
+    def covers(self, guesses, solutions):
+        """True if every given guess and solution has a row/column in the matrix."""
+        return (
+            all(word in self.guess_index for word in guesses)
+            and all(word in self.solution_index for word in solutions)
+        )
+
+    def guess_indices(self, words):
+        """Row indices for a list of guess words."""
+        return np.fromiter((self.guess_index[word] for word in words), dtype=np.intp, count=len(words))
+
+    def solution_indices(self, words):
+        """Column indices for a list of solution words."""
+        return np.fromiter((self.solution_index[word] for word in words), dtype=np.intp, count=len(words))
+
+    def row(self, guess, solutions=None):
+        """Pattern codes of one guess against all solutions (or the given subset)."""
+        row = self.codes[self.guess_index[guess]]
+        if solutions is None:
+            return row
+        return row[self.solution_indices(solutions)]
+
+    def submatrix(self, guesses, solutions):
+        """Pattern codes for the given guess words (rows) x solution words (columns)."""
+        return self.codes[np.ix_(self.guess_indices(guesses), self.solution_indices(solutions))]
+
+
+def matrix_path(guesses, solutions, cache_dir=CACHE_DIR):
+    """Cache file path for a pair of canonical word lists."""
+    return Path(cache_dir) / f"patterns-v{FORMAT_VERSION}-{word_list_hash(guesses, solutions)}.npy"
+
+
+def build_pattern_matrix(guesses, solutions=None, cache_dir=CACHE_DIR):
+    """
+    Compute the pattern matrix and save it to the cache directory.
+
+    If solutions is None the guess list is used for both axes.
+    Returns the path of the written .npy file.
+    """
+    guesses = canonical_words(guesses)
+    solutions = guesses if solutions is None else canonical_words(solutions)
+    path = matrix_path(guesses, solutions, cache_dir)
+
+    codes = compute_pattern_codes(guesses, solutions)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, codes)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+@timed('pattern_matrix_load')
+def load_pattern_matrix(guesses, solutions=None, cache_dir=CACHE_DIR, build=True):
+    """
+    Load (memory-mapped) the pattern matrix for the given word lists.
+
+    Builds and caches it first if no matching file exists and build is True;
+    otherwise returns None when it is missing.
+    """
+    guesses = canonical_words(guesses)
+    solutions = guesses if solutions is None else canonical_words(solutions)
+    path = matrix_path(guesses, solutions, cache_dir)
+
+    if not path.exists():
+        if not build:
+            return None
+        print(f"Building {len(guesses)} x {len(solutions)} pattern matrix (one-time)...")
+        build_pattern_matrix(guesses, solutions, cache_dir)
+
+    codes = np.load(path, mmap_mode='r')
+    if codes.shape != (len(guesses), len(solutions)):
+        raise ValueError(f"Pattern matrix {path} does not match the word lists")
+
+    return PatternMatrix(guesses, solutions, codes, path)
+
+
+def ensure_pattern_matrix(guesses, solutions, matrix=None):
+    """
+    Return a PatternMatrix covering the given words.
+
+    Uses the supplied matrix when it covers them; otherwise computes an
+    in-memory (uncached) one for exactly these words.
+    """
+    if matrix is not None and matrix.covers(guesses, solutions):
+        return matrix
+    return PatternMatrix(list(guesses), list(solutions), compute_pattern_codes(guesses, solutions))
+
+
+if __name__ == "__main__":
+    from entropy import fetch_all_valid_words, fetch_all_words
+
+    valid_words = fetch_all_valid_words()
+    all_words = fetch_all_words()
+
+    for words in (valid_words, all_words):
+        matrix = load_pattern_matrix(words)
+        print(f"  {matrix} -> {matrix.path}")
@@ -0,0 +1,41 @@
+"""
+Frequency Priors for Weighted Entropy
+
+The plain entropy calculations treat every candidate as equally likely, but
+the game only picks solutions with frequency >= 20, so common words are far
+more likely answers than obscure ones. This module turns the words table's
+frequency column into a prior probability per word: a sigmoid over
+log10(frequency + 1), centred on the game's solution cutoff.
+"""
+
+import numpy as np
+
+from word_store import SOLUTION_MIN_FREQUENCY, get_word_store
+
+# Sigmoid midpoint (weight 0.5) at the game's solution cutoff
+PRIOR_CENTER = np.log10(SOLUTION_MIN_FREQUENCY + 1)
+
+# Sigmoid width in decades of frequency; smaller = sharper cutoff
+PRIOR_WIDTH = 0.3
+
+
+def frequency_prior(frequencies, center=PRIOR_CENTER, width=PRIOR_WIDTH):
+    """Unnormalized prior weight (0-1) for each frequency in an array."""
+    log_frequency = np.log10(np.asarray(frequencies, dtype=np.float64) + 1)
+    return 1.0 / (1.0 + np.exp(-(log_frequency - center) / width))
+
+
+def word_priors(words, store=None):
+    """Prior weight for each word, aligned with words (unknown words count as frequency 0)."""
+    store = store or get_word_store()
+    return frequency_prior([store.frequency(word) for word in words])
+
+
+def distribution_entropy(weights):
+    """Entropy in bits of the distribution given by (unnormalized) weights."""
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        return 0.0
+    p = weights[weights > 0] / total
+    return float(-(p * np.log2(p)).sum())
@@ -0,0 +1,286 @@
+"""
+Vectorized Entropy Ranking
+
+Ranks every allowed guess against a candidate set in one batched pass over a
+block of pattern codes: a per-row bincount gives each guess's 243-slot
+pattern histogram, and the entropies of all rows are computed together.
+Top-N selection uses argpartition instead of sorting every guess.
+
+The weighted variants take a prior probability per candidate (see
+priors.py): the bincount sums weights instead of counting, at the same cost.
+
+bounded_top_n is a branch-and-bound variant of the top-N search: a cheap
+per-position upper bound on each guess's entropy orders the guesses, and
+once the Nth best entropy found beats every remaining bound the rest are
+skipped without changing the result.
+"""
+
+import numpy as np
+
+from feedback import NUM_PATTERNS, WORD_LENGTH
+from instrumentation import count
+
+# Guess rows per bincount block (bounds the temporary offset-code array)
+RANK_CHUNK_SIZE = 256
+
+# Rough information a typical guess yields, used to turn leftover bits into guesses
+BITS_PER_GUESS = 4.0
+
+# Slack when comparing bounds with computed entropies (float rounding)
+BOUND_TOLERANCE = 1e-9
+
+
+def pattern_histograms(codes):
+    """
+    Count patterns per row of a (G, S) code block.
+
+    Returns a (G, 243) int64 array of pattern counts.
+    """
+    rows = codes.shape[0]
+    offsets = np.arange(rows, dtype=np.intp)[:, None] * NUM_PATTERNS
+    flat = (codes + offsets).ravel()
+    return np.bincount(flat, minlength=rows * NUM_PATTERNS).reshape(rows, NUM_PATTERNS)
+
+
+def entropies_from_histograms(histograms, total):
+    """
+    Entropy in bits of each row of a (G, 243) pattern histogram.
+
+    Counts are sorted within each row first, so guesses that split the
+    candidates into the same bucket sizes get bit-identical entropies and
+    ties are broken purely by guess order.
+    """
+    counts = np.sort(histograms, axis=1)
+    probabilities = counts / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(counts > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=1)
+
+
+def entropies_from_codes(codes):
+    """Entropy of every row (guess) of a (G, S) pattern code block."""
+    return entropies_from_histograms(pattern_histograms(codes), codes.shape[1])
+
+
+def batch_entropies(codes, guess_idx, solution_idx, chunk_size=RANK_CHUNK_SIZE):
+    """
+    Entropy of each guess row in guess_idx against the solution columns in solution_idx.
+
+    Args:
+        codes: Full (guesses x solutions) pattern code array (may be memory-mapped)
+        guess_idx: Row indices of the guesses to evaluate
+        solution_idx: Column indices of the remaining candidate solutions
+
+    Returns:
+        float64 array aligned with guess_idx
+    """
+    guess_idx = np.asarray(guess_idx, dtype=np.intp)
+    solution_idx = np.asarray(solution_idx, dtype=np.intp)
+
+    entropies = np.empty(len(guess_idx), dtype=np.float64)
+    if len(solution_idx) == 0:
+        entropies.fill(0.0)
+        return entropies
+
+    for start in range(0, len(guess_idx), chunk_size):
+        rows = guess_idx[start:start + chunk_size]
+        block = codes[np.ix_(rows, solution_idx)]
+        entropies[start:start + chunk_size] = entropies_from_codes(block)
+
+    return entropies
+
+
+def weighted_histograms(codes, weights):
+    """
+    Sum candidate weights per pattern for each row of a (G, S) code block.
+
+    Returns a (G, 243) float64 array of pattern probabilities (unnormalized).
+    """
+    rows = codes.shape[0]
+    offsets = np.arange(rows, dtype=np.intp)[:, None] * NUM_PATTERNS
+    flat = (codes + offsets).ravel()
+    tiled = np.broadcast_to(weights, codes.shape).ravel()
+    return np.bincount(flat, weights=tiled, minlength=rows * NUM_PATTERNS).reshape(rows, NUM_PATTERNS)
+
+
+def batch_weighted_entropies(codes, guess_idx, solution_idx, weights, chunk_size=RANK_CHUNK_SIZE):
+    """
+    Weighted entropy of each guess in guess_idx against the solution columns.
+
+    Same as batch_entropies, but each candidate counts with its prior weight
+    (weights is aligned with solution_idx and need not sum to 1).
+    """
+    guess_idx = np.asarray(guess_idx, dtype=np.intp)
+    solution_idx = np.asarray(solution_idx, dtype=np.intp)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    entropies = np.zeros(len(guess_idx), dtype=np.float64)
+    total = weights.sum()
+    if len(solution_idx) == 0 or total <= 0:
+        return entropies
+
+    for start in range(0, len(guess_idx), chunk_size):
+        rows = guess_idx[start:start + chunk_size]
+        block = codes[np.ix_(rows, solution_idx)]
+        entropies[start:start + chunk_size] = entropies_from_histograms(weighted_histograms(block, weights), total)
+
+    return entropies
+
+
+def expected_guesses(entropies, win_probabilities, prior_entropy, bits_per_guess=None):
+    """
+    Expected total guesses (this one included) for each guess.
+
+    A guess wins outright with its own prior probability; otherwise the
+    uncertainty left after it (prior entropy minus the information it
+    gains) is assumed to cost about one more guess per bits_per_guess
+    bits, plus the final winning guess.
+    """
+    bits_per_guess = bits_per_guess or BITS_PER_GUESS
+    remaining_bits = np.maximum(prior_entropy - entropies, 0.0)
+    later_guesses = 1.0 + remaining_bits / bits_per_guess
+    return win_probabilities + (1.0 - win_probabilities) * (1.0 + later_guesses)
+
+
+def top_n_indices(values, n, largest=True):
+    """
+    Positions of the n largest (or smallest) values, best first.
+
+    Equal values keep their original order, matching a stable sort of the
+    full array, but only the selected n elements are ever sorted.
+    """
+    keys = -values if largest else values
+    n = min(n, len(keys))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if n < len(keys):
+        cutoff = keys[np.argpartition(keys, n - 1)[:n]].max()
+        better = np.flatnonzero(keys < cutoff)
+        ties = np.flatnonzero(keys == cutoff)[:n - len(better)]
+        selected = np.concatenate([better, ties])
+    else:
+        selected = np.arange(len(keys))
+
+    return selected[np.lexsort((selected, keys[selected]))]
+
+
+def rank_guesses(codes, guess_idx, solution_idx, n=10, worst=False):
+    """
+    Rank guesses by entropy against the candidate solutions.
+
+    Returns (positions, entropies): positions index into guess_idx, best
+    first (or worst first when worst=True); entropies covers every guess.
+    """
+    entropies = batch_entropies(codes, guess_idx, solution_idx)
+    return top_n_indices(entropies, n, largest=not worst), entropies
+
+
+def _binary_entropy(p):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    return np.where((p > 0) & (p < 1), terms, 0.0)
+
+
+def entropy_upper_bounds(guess_letters, solution_letters):
+    """
+    Cheap upper bound on the entropy of each guess against the solutions.
+
+    The pattern's entropy is at most the sum of its five per-position
+    entropies. At position i, green has probability p (solutions with the
+    guess letter there) and yellow at most y (solutions with the letter
+    elsewhere but not there), so that position contributes at most
+    h(p) + (1 - p) * h(min(y / (1 - p), 1/2)). The total is capped at
+    log2 of the number of solutions.
+
+    Args:
+        guess_letters: (G, 5) letter indices of the guesses
+        solution_letters: (S, 5) letter indices of the candidate solutions
+
+    Returns:
+        float64 array of G bounds
+    """
+    total = len(solution_letters)
+    if total == 0:
+        return np.zeros(len(guess_letters), dtype=np.float64)
+
+    positions = np.arange(WORD_LENGTH)
+    green = np.zeros((WORD_LENGTH, 26), dtype=np.int64)
+    np.add.at(green, (np.broadcast_to(positions, solution_letters.shape), solution_letters), 1)
+
+    contains = np.zeros((total, 26), dtype=bool)
+    contains[np.arange(total)[:, None], solution_letters] = True
+    present = contains.sum(axis=0)
+
+    # The bound of a letter at a position only depends on that pair: build
+    # the (5, 26) table once and gather it for every guess
+    p_green = green / total
+    p_yellow = (present[None, :] - green) / total
+    rest = 1.0 - p_green
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q = np.where(rest > 0, np.minimum(p_yellow / rest, 0.5), 0.0)
+    table = _binary_entropy(p_green) + rest * _binary_entropy(q)
+
+    guess_letters = np.asarray(guess_letters, dtype=np.intp)
+    bounds = table[positions, guess_letters].sum(axis=1)
+    return np.minimum(bounds, np.log2(total))
+
+
+def bounded_top_n(codes, guess_idx, solution_idx, bounds, n=10, chunk_size=RANK_CHUNK_SIZE):
+    """
+    Top n guesses by entropy, skipping guesses whose bound cannot make the cut.
+
+    Guesses are evaluated in blocks in order of decreasing bound; a guess is
+    pruned once its bound is below the Nth best entropy found so far. The
+    result (including tie order) is the same as rank_guesses.
+
+    Args:
+        codes: Full (guesses x solutions) pattern code array
+        guess_idx: Row indices of the guesses to rank
+        solution_idx: Column indices of the candidate solutions
+        bounds: Upper bound per guess, aligned with guess_idx (entropy_upper_bounds)
+        n: Number of results to keep
+
+    Returns:
+        (positions, entropies, stats): positions index into guess_idx, best
+        first; stats counts the guesses evaluated and pruned
+    """
+    guess_idx = np.asarray(guess_idx, dtype=np.intp)
+    if n <= 0:
+        stats = {'evaluated': 0, 'pruned': len(guess_idx)}
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64), stats
+    order = np.argsort(-bounds, kind='stable')
+    max_entropy = np.log2(len(solution_idx)) if len(solution_idx) else 0.0
+
+    top_positions = np.empty(0, dtype=np.intp)
+    top_entropies = np.empty(0, dtype=np.float64)
+    evaluated = 0
+
+    for start in range(0, len(order), chunk_size):
+        block = order[start:start + chunk_size]
+        if len(top_positions) >= n:
+            threshold = top_entropies[-1] - BOUND_TOLERANCE
+            keep = bounds[block] >= threshold
+            if top_entropies[-1] >= max_entropy - BOUND_TOLERANCE:
+                # The cut is a perfect split: only another perfect split (a
+                # bit-identical entropy) can tie it, and only an earlier guess wins
+                keep &= block < top_positions[-1]
+            block = block[keep]
+            if len(block) == 0:
+                if start + chunk_size < len(order) and bounds[order[start + chunk_size]] >= threshold:
+                    continue
+                break
+
+        entropies = batch_entropies(codes, guess_idx[block], solution_idx, chunk_size)
+        evaluated += len(block)
+
+        positions = np.concatenate([top_positions, block])
+        entropies = np.concatenate([top_entropies, entropies])
+        keep = np.lexsort((positions, -entropies))[:n]
+        top_positions, top_entropies = positions[keep], entropies[keep]
+
+    stats = {'evaluated': evaluated, 'pruned': len(guess_idx) - evaluated}
+    count('bounded_searches')
+    count('guesses_evaluated', stats['evaluated'])
+    count('guesses_pruned', stats['pruned'])
+    return top_positions, top_entropies, stats
@@ -0,0 +1,162 @@
+"""
+Ranking Cache
+
+Many games reach the same candidate set (the same opener and feedback give
+the same pool), so top-N rankings are memoized under a stable hash of the
+guess pool, the sorted candidate set and the ranking options. The in-memory
+tier is a bounded LRU (entry and byte limits); an optional sqlite file keeps
+rankings across sessions. One process-wide cache is shared by the cheater,
+SolverState and the batch tools through get_ranking_cache().
+
+Configure with RANKING_CACHE_ENTRIES, RANKING_CACHE_BYTES and
+RANKING_CACHE_PATH (unset = memory only).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+from instrumentation import count
+
+DEFAULT_MAX_ENTRIES = int(os.getenv('RANKING_CACHE_ENTRIES', '4096'))
+DEFAULT_MAX_BYTES = int(os.getenv('RANKING_CACHE_BYTES', str(16 * 1024 * 1024)))
+DEFAULT_PATH = os.getenv('RANKING_CACHE_PATH') or None
+
+
+def ranking_key(guesses, candidates, **options):
+    """
+    Stable key for a ranking of guesses (in order; order decides ties)
+    against a candidate set (order-insensitive) with the given options.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\n".join(guesses).encode())
+    digest.update(b"|")
+    digest.update("\n".join(sorted(candidates)).encode())
+    digest.update(b"|")
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class RankingCache:
+    """
+    LRU cache of top-N rankings ([(word, value), ...]) with an optional sqlite tier.
+
+    A ranking stored for n results also answers any smaller n.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, path=DEFAULT_PATH):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()  # key -> (n, ranking, size)
+        self._bytes = 0
+        self._db = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    def _connection(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rankings (key TEXT PRIMARY KEY, n INTEGER, ranking TEXT)"
+            )
+        return self._db
+
+    def get(self, key, n):
+        """Ranking for key with at least n results (or None)."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= n:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            count('ranking_cache_hits')
+            return entry[1][:n]
+
+        db = self._connection()
+        if db is not None:
+            row = db.execute("SELECT n, ranking FROM rankings WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] >= n:
+                ranking = [tuple(item) for item in json.loads(row[1])]
+                self._remember(key, row[0], ranking, len(row[1]))
+                self.disk_hits += 1
+                count('ranking_cache_disk_hits')
+                return ranking[:n]
+
+        self.misses += 1
+        count('ranking_cache_misses')
+        return None
+
+    def put(self, key, n, ranking):
+        """Store the top-n ranking for key (in memory, and on disk if configured)."""
+        payload = json.dumps(ranking)
+        self._remember(key, n, ranking, len(payload))
+
+        db = self._connection()
+        if db is not None:
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO rankings (key, n, ranking) VALUES (?, ?, ?)",
+                    (key, n, payload),
+                )
+
+    def _remember(self, key, n, ranking, size):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (n, ranking, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def cached(self, key, n, compute):
+        """Return the cached ranking for key, or compute(), store and return it."""
+        ranking = self.get(key, n)
+        if ranking is None:
+            ranking = compute()
+            self.put(key, n, ranking)
+            # A copy, like hits return, so callers cannot mutate the stored entry
+            ranking = ranking[:n]
+        return ranking
+
+    def clear(self):
+        """Drop the in-memory tier (the sqlite file is kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+_shared_cache = None
+
+
+def get_ranking_cache():
+    """Process-wide RankingCache configured from the environment."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RankingCache()
+    return _shared_cache
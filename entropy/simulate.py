@@ -0,0 +1,295 @@
+"""
+Batch Self-Play Simulator
+
+Plays every word of a solution set (or a random sample) through a pluggable
+guessing strategy and reports how good and how fast it is: the guess-count
+histogram, failure rate, and per-turn and total latency. Games are spread
+across processes; each worker memory-maps the same pattern matrix.
+
+Results are written as JSON so runs can be compared across versions.
+
+Usage:
+    python simulate.py --strategy max-entropy --solutions nyt --workers 4
+    python simulate.py --strategy tree --tree decision_tree.json --out run.json
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from decision_tree import DecisionTree
+from feedback import ALL_GREEN_CODE
+from pattern_matrix import load_pattern_matrix
+from priors import distribution_entropy, word_priors
+from ranking import (
+    batch_entropies,
+    batch_weighted_entropies,
+    bounded_top_n,
+    entropy_upper_bounds,
+    expected_guesses,
+    top_n_indices,
+)
+from word_store import get_word_store
+
+MAX_TURNS = 6
+
+# Games per task handed to a worker
+GAMES_PER_TASK = 64
+
+
+class Simulator:
+    """Plays games against a pattern matrix with a named strategy."""
+
+    def __init__(self, matrix, allowed_guesses, solutions, strategy, tree=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}' (choose from {', '.join(STRATEGIES)})")
+
+        self.matrix = matrix
+        self.codes = matrix.codes
+        self.allowed_rows = matrix.guess_indices(allowed_guesses)
+        self.solution_cols = matrix.solution_indices(solutions)
+        self.strategy = STRATEGIES[strategy]
+        self.tree = tree
+
+        # Frequency prior per solution column (for the frequency-weighted strategy)
+        self.prior = word_priors(matrix.solutions)
+
+        # Guess row for each solution column (-1 if that solution is not guessable)
+        self.row_of_col = np.array(
+            [matrix.guess_index.get(word, -1) for word in matrix.solutions], dtype=np.intp
+        )
+        self._opening_guess = None
+
+    def guess_pool(self, cols):
+        """Allowed guess rows with the remaining candidates first (so they win ties)."""
+        candidate_rows = self.row_of_col[cols]
+        candidate_rows = candidate_rows[candidate_rows >= 0]
+        others = self.allowed_rows[~np.isin(self.allowed_rows, candidate_rows)]
+        return np.concatenate([candidate_rows, others]), len(candidate_rows)
+
+    def next_guess(self, cols, history):
+        """Guess row for the current candidate columns."""
+        if len(cols) == 1 and self.row_of_col[cols[0]] >= 0:
+            return self.row_of_col[cols[0]]
+
+        # The opening position is the same in every game
+        if not history:
+            if self._opening_guess is None:
+                self._opening_guess = self.strategy(self, cols, history)
+            return self._opening_guess
+
+        return self.strategy(self, cols, history)
+
+    def play(self, solution):
+        """Play one game. Returns (guesses used or None if unsolved, per-turn seconds)."""
+        target = self.matrix.solution_index[solution]
+        cols = self.solution_cols
+        history = []
+        latencies = []
+
+        for turn in range(1, MAX_TURNS + 1):
+            start = time.perf_counter()
+            row = self.next_guess(cols, history)
+            latencies.append(time.perf_counter() - start)
+
+            code = int(self.codes[row, target])
+            if code == ALL_GREEN_CODE:
+                return turn, latencies
+
+            history.append((self.matrix.guesses[row], code))
+            cols = cols[self.codes[row, cols] == code]
+
+        return None, latencies
+
+
+def max_entropy(sim, cols, history):
+    """Highest-entropy allowed guess (candidates win ties)."""
+    rows, _ = sim.guess_pool(cols)
+    bounds = entropy_upper_bounds(sim.matrix.guess_letters[rows], sim.matrix.solution_letters[cols])
+    positions, _, _ = bounded_top_n(sim.codes, rows, cols, bounds, 1)
+    return rows[positions[0]]
+
+
+def min_entropy(sim, cols, history):
+    """Lowest-entropy remaining candidate (the least-likely-entropy strategy)."""
+    rows = sim.row_of_col[cols]
+    rows = rows[rows >= 0]
+    return rows[top_n_indices(batch_entropies(sim.codes, rows, cols), 1, largest=False)[0]]
+
+
+def frequency_weighted(sim, cols, history):
+    """Lowest expected total guesses under the frequency prior (see priors.py)."""
+    rows, num_candidates = sim.guess_pool(cols)
+    weights = sim.prior[cols]
+    entropies = batch_weighted_entropies(sim.codes, rows, cols, weights)
+
+    win_probabilities = np.zeros(len(rows))
+    win_probabilities[:num_candidates] = weights[sim.row_of_col[cols] >= 0] / weights.sum()
+    scores = expected_guesses(entropies, win_probabilities, distribution_entropy(weights))
+    return rows[top_n_indices(scores, 1, largest=False)[0]]
+
+
+def tree_strategy(sim, cols, history):
+    """Walk the decision tree; fall back to max-entropy if the game leaves it."""
+    guess = sim.tree.next_guess(history) if sim.tree else None
+    if guess is None:
+        return max_entropy(sim, cols, history)
+    return sim.matrix.guess_index[guess]
+
+
+STRATEGIES = {
+    'max-entropy': max_entropy,
+    'min-entropy': min_entropy,
+    'frequency-weighted': frequency_weighted,
+    'tree': tree_strategy,
+}
+
+
+# Per-worker simulator set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(allowed_guesses, solutions, strategy, tree_path):
+    matrix = load_pattern_matrix(allowed_guesses, solutions, build=False)
+    tree = DecisionTree.load(tree_path) if tree_path else None
+    _worker['sim'] = Simulator(matrix, allowed_guesses, solutions, strategy, tree)
+
+
+def _play_batch(words):
+    sim = _worker['sim']
+    return [(word, *sim.play(word)) for word in words]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(results, strategy, elapsed, config):
+    """Build the JSON report from [(word, guesses or None, turn latencies), ...]."""
+    histogram = {str(turn): 0 for turn in range(1, MAX_TURNS + 1)}
+    failures = []
+    per_turn = [[] for _ in range(MAX_TURNS)]
+    game_latencies = []
+
+    for word, guesses, latencies in results:
+        if guesses is None:
+            failures.append(word)
+        else:
+            histogram[str(guesses)] += 1
+        for turn, seconds in enumerate(latencies):
+            per_turn[turn].append(seconds)
+        game_latencies.append(sum(latencies))
+
+    solved = [guesses for _, guesses, _ in results if guesses is not None]
+
+    def latency_stats(samples):
+        if not samples:
+            return None
+        ms = np.array(samples) * 1000
+        return {
+            'count': len(samples),
+            'mean_ms': float(ms.mean()),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p95_ms': float(np.percentile(ms, 95)),
+            'max_ms': float(ms.max()),
+        }
+
+    return {
+        'strategy': strategy,
+        'revision': _git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': config,
+        'games': len(results),
+        'histogram': histogram,
+        'average_guesses': sum(solved) / len(solved) if solved else None,
+        'failure_rate': len(failures) / len(results) if results else 0.0,
+        'failures': failures,
+        'latency': {
+            'per_turn': {str(turn + 1): latency_stats(samples) for turn, samples in enumerate(per_turn)},
+            'per_game': latency_stats(game_latencies),
+            'total_solver_seconds': float(sum(game_latencies)),
+            'wall_seconds': elapsed,
+        },
+    }
+
+
+def run_simulation(allowed_guesses, solutions, strategy, words=None, workers=1, tree_path=None):
+    """
+    Play every word in words (default: all solutions) and return the report dict.
+
+    The pattern matrix for (allowed_guesses, solutions) is built first if needed.
+    """
+    words = list(solutions) if words is None else list(words)
+    load_pattern_matrix(allowed_guesses, solutions)
+
+    start = time.perf_counter()
+    if workers <= 1:
+        _init_worker(allowed_guesses, solutions, strategy, tree_path)
+        results = _play_batch(words)
+    else:
+        batches = [words[i:i + GAMES_PER_TASK] for i in range(0, len(words), GAMES_PER_TASK)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(allowed_guesses, solutions, strategy, tree_path),
+        ) as pool:
+            results = [game for batch in pool.map(_play_batch, batches) for game in batch]
+    elapsed = time.perf_counter() - start
+
+    config = {
+        'allowed_guesses': len(allowed_guesses),
+        'solutions': len(solutions),
+        'workers': workers,
+        'tree': tree_path,
+    }
+    return summarize(results, strategy, elapsed, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark a Wordle strategy by playing every solution")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='max-entropy')
+    parser.add_argument('--solutions', choices=['nyt', 'frequent'], default='nyt',
+                        help="nyt_words list, or words with frequency >= 20")
+    parser.add_argument('--sample', type=int, help="play a random sample of this many solutions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--tree', help="decision tree JSON for the tree strategy")
+    parser.add_argument('--out', help="write the JSON report here")
+    args = parser.parse_args()
+
+    store = get_word_store()
+    solutions = store.nyt_words() if args.solutions == 'nyt' else store.solution_words()
+    allowed_guesses = sorted(set(store.all_words()) | set(solutions))
+
+    words = solutions
+    if args.sample:
+        words = random.Random(args.seed).sample(solutions, min(args.sample, len(solutions)))
+
+    report = run_simulation(allowed_guesses, solutions, args.strategy, words, args.workers, args.tree)
+    report['config'].update(solution_set=args.solutions, sample=args.sample, seed=args.seed)
+
+    print(f"Strategy: {report['strategy']}  Games: {report['games']}")
+    print("Histogram: " + "  ".join(f"{turn}:{count}" for turn, count in report['histogram'].items()))
+    average = report['average_guesses']
+    print(f"Average guesses: {average:.4f}" if average else "Average guesses: n/a")
+    print(f"Failure rate: {report['failure_rate']:.2%}")
+    print(f"Wall time: {report['latency']['wall_seconds']:.1f}s")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
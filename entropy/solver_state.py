@@ -0,0 +1,148 @@
+"""
+Incremental Solver State
+
+Holds the remaining candidates of one game as an index array into a
+PatternMatrix's solution columns. apply(guess, feedback) narrows it with a
+single comparison against the guess's row of pattern codes instead of
+re-filtering the dictionary, undo() steps back, and rankings go through the
+shared ranking cache (see ranking_cache.py), so no position is ranked twice
+by this or any other session using the same cache. Rankings are keyed by
+the state's fingerprint (a hash of the candidate and guess-pool index
+arrays), so a lookup never re-hashes the word strings.
+
+In hard mode (see constraints.hard_mode_constraints) the guess pool is
+narrowed alongside the candidates: each apply() folds the feedback into the
+hard-mode constraints and re-tests only the guesses still in the pool.
+"""
+
+import hashlib
+
+import numpy as np
+
+from constraints import ConstraintIndex, hard_mode_constraints
+from feedback import as_feedback_code
+from instrumentation import span
+from parallel_ranking import parallel_rank_guesses
+from pattern_matrix import compute_pattern_codes, word_list_hash
+from ranking_cache import get_ranking_cache
+
+
+class SolverState:
+    """Remaining candidates for one game, narrowed incrementally."""
+
+    def __init__(self, matrix, allowed_guesses=None, solutions=None, cache=None, hard_mode=None):
+        self.matrix = matrix
+        self.cache = cache or get_ranking_cache()
+        allowed_guesses = matrix.guesses if allowed_guesses is None else allowed_guesses
+        solutions = matrix.solutions if solutions is None else solutions
+
+        self.allowed_rows = matrix.guess_indices(allowed_guesses)
+        self.candidates = np.sort(matrix.solution_indices(solutions))
+        self.history = []
+
+        # Guess row for each solution column (-1 if that solution is not guessable)
+        self.row_of_col = np.array(
+            [matrix.guess_index.get(word, -1) for word in matrix.solutions], dtype=np.intp
+        )
+
+        # Hard mode: constraints on guesses, tested against an index of the guess words
+        self.hard_constraints = hard_mode_constraints(hard_mode)
+        self.guess_word_index = ConstraintIndex(matrix.guesses) if self.hard_constraints else None
+
+        # Identifies the matrix's word lists, so index arrays are comparable across states
+        self._matrix_key = word_list_hash(matrix.guesses, matrix.solutions)
+        self._fingerprint = None
+        self._undo_stack = []
+
+    def __len__(self):
+        return len(self.candidates)
+
+    @property
+    def candidate_words(self):
+        """Remaining candidates as words."""
+        return [self.matrix.solutions[col] for col in self.candidates]
+
+    @property
+    def guess_words(self):
+        """Guesses currently allowed (all of allowed_guesses unless in hard mode)."""
+        return [self.matrix.guesses[row] for row in self.allowed_rows]
+
+    def allows(self, guess):
+        """True if guess may be played now (always, outside hard mode)."""
+        if self.hard_constraints is None:
+            return True
+        row = self.matrix.guess_index.get(guess)
+        return row is not None and bool((self.allowed_rows == row).any())
+
+    @property
+    def fingerprint(self):
+        """Stable hash of the current candidate set and guess pool (in order)."""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(self._matrix_key.encode())
+            digest.update(self.candidates.tobytes())
+            digest.update(b"|")
+            digest.update(self.allowed_rows.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def _codes_for(self, guess):
+        """Pattern codes of a guess against the current candidates."""
+        row = self.matrix.guess_index.get(guess)
+        if row is not None:
+            return self.matrix.codes[row, self.candidates]
+        # Guess outside the matrix: compute its row on the fly
+        return compute_pattern_codes([guess], self.candidate_words)[0]
+
+    def apply(self, guess, feedback):
+        """
+        Narrow the candidates with one guess and its feedback.
+
+        Feedback may be a tuple of ("Green", "Yellow", "Gray") or a pattern code.
+        Returns the number of candidates left.
+        """
+        code = as_feedback_code(feedback)
+        constraints = self.hard_constraints
+        self._undo_stack.append((self.candidates, self.allowed_rows, constraints))
+
+        with span('filter'):
+            self.candidates = self.candidates[self._codes_for(guess) == code]
+            if constraints is not None:
+                self.hard_constraints = constraints.copy().add(guess, code)
+                self.allowed_rows = self.guess_word_index.filter(self.hard_constraints, self.allowed_rows)
+
+        self.history.append((guess, code))
+        self._fingerprint = None
+        return len(self.candidates)
+
+    def undo(self):
+        """Revert the last apply(). Returns the (guess, code) that was undone."""
+        if not self._undo_stack:
+            raise IndexError("Nothing to undo")
+        self.candidates, self.allowed_rows, self.hard_constraints = self._undo_stack.pop()
+        self._fingerprint = None
+        return self.history.pop()
+
+    def guess_rows(self):
+        """Allowed guess rows with the remaining candidates first (so they win ties)."""
+        candidate_rows = self.row_of_col[self.candidates]
+        is_candidate = np.isin(self.allowed_rows, candidate_rows[candidate_rows >= 0])
+        return np.concatenate([self.allowed_rows[is_candidate], self.allowed_rows[~is_candidate]])
+
+    def top_guesses(self, n=10, workers=None):
+        """
+        Best n guesses by entropy for the current candidates.
+
+        Returns list of (word, entropy) tuples, the same as
+        entropy.get_best_guesses. Cached under the state's fingerprint.
+        """
+        with span('rank'):
+            key = f"state:{self.fingerprint}"
+            return self.cache.cached(key, n, lambda: self._rank(n, workers))
+
+    def _rank(self, n, workers):
+        rows = self.guess_rows()
+        positions, entropies = parallel_rank_guesses(
+            self.matrix, rows, self.candidates, n, workers=workers
+        )
+        return [(self.matrix.guesses[rows[i]], float(e)) for i, e in zip(positions, entropies)]
@@ -0,0 +1,192 @@
+"""
+Benchmarks for Feedback, Filtering and Ranking (pytest-benchmark)
+
+Times the Python hot paths on fixed word lists (the N most frequent words of
+data/word_ranking_by_frequency.csv, N = 100, 1k, 6k and 12k) without MySQL:
+
+- generate_feedback (reference) and the vectorized pattern-code engine
+- compute_entropy, with and without a pattern matrix
+- filter_candidates (matrix and constraint-index paths) and the
+  build_sql_from_feedback conditions run against an in-memory sqlite table
+- get_top_entropy_words over the whole list (wall time; the branch-and-bound
+  search skips most guesses, so the guesses it actually evaluated are
+  recorded in extra_info instead of an n^2 operation count)
+
+The test_*_match_* tests cross-check the fast paths against the reference
+implementations. pytest.ini passes --benchmark-disable, so a plain pytest
+run executes every benchmark once as a smoke test; --benchmark-enable times
+them. benchmark_baseline.json is the committed baseline to compare with.
+
+Usage:
+    pip install -r requirements-dev.txt
+    python -m pytest test_benchmark.py --benchmark-enable
+    python -m pytest test_benchmark.py --benchmark-enable \\
+        --benchmark-compare=benchmark_baseline.json --benchmark-compare-fail=mean:25%
+    python -m pytest test_benchmark.py --benchmark-enable --benchmark-json=benchmark_baseline.json
+"""
+
+import csv
+import random
+import sqlite3
+from functools import lru_cache
+
+import pytest
+
+import instrumentation
+from entropy import (
+    compute_entropy,
+    filter_candidates,
+    generate_feedback,
+    get_top_entropy_words,
+)
+from feedback import encode_feedback
+from pattern_matrix import compute_pattern_codes, load_pattern_matrix
+from ranking_cache import get_ranking_cache
+from word_store import RANKING_CSV, get_word_store
+from wordle_cheater import build_sql_from_feedback
+
+SIZES = (100, 1000, 6000, 12000)
+
+# Work per benchmark (kept fixed so runs are comparable)
+FEEDBACK_PAIRS = 20000
+CODE_GUESSES = 256
+ENTROPY_GUESSES = 100
+REFERENCE_ENTROPY_GUESSES = 3
+FILTER_CASES = 50
+
+# Reference ranking is O(n^2) pure Python; only cross-check it up to this size
+REFERENCE_RANKING_MAX = 1000
+
+
+@lru_cache(maxsize=None)
+def load_benchmark_words(size, path=RANKING_CSV):
+    """The size most frequent words, by word_rank."""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = sorted(csv.DictReader(f), key=lambda row: int(row['word_rank']))
+    return [row['word'].lower() for row in rows[:size]]
+
+
+def sql_filter(connection, guess, feedback):
+    """Run the cheater's SQL conditions for one guess against the sqlite words table."""
+    conditions = build_sql_from_feedback(guess, feedback)
+    # SUBSTRING is MySQL; sqlite spells it SUBSTR
+    where = " AND ".join(conditions).replace("SUBSTRING(", "SUBSTR(")
+    query = "SELECT LOWER(word) FROM words" + (f" WHERE {where}" if where else "")
+    return [row[0] for row in connection.execute(query)]
+
+
+def sqlite_words(words):
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE words (word TEXT)")
+    connection.executemany("INSERT INTO words (word) VALUES (?)", [(word,) for word in words])
+    return connection
+
+
+def filter_cases(words, seed=0):
+    """Fixed (guess, feedback) cases drawn from the word list."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(FILTER_CASES):
+        guess, solution = rng.choice(words), rng.choice(words)
+        cases.append((guess, generate_feedback(guess, solution)))
+    return cases
+
+
+@pytest.fixture(scope='session')
+def matrix():
+    # The full dictionary's matrix covers every list (and is usually cached already)
+    words = load_benchmark_words(max(SIZES))
+    return load_pattern_matrix(sorted(set(get_word_store().all_words()) | set(words)))
+
+
+@pytest.fixture(params=SIZES, ids=str)
+def words(request):
+    return load_benchmark_words(request.param)
+
+
+def test_pattern_codes_match_generate_feedback(words):
+    guesses = random.Random(len(words)).sample(words, min(len(words), 50))
+    codes = compute_pattern_codes(guesses, words)
+    for i, guess in enumerate(guesses):
+        assert list(codes[i]) == [encode_feedback(generate_feedback(guess, solution)) for solution in words]
+
+
+def test_compute_entropy_matrix_matches_reference(words, matrix):
+    for guess in words[:REFERENCE_ENTROPY_GUESSES]:
+        assert compute_entropy(words, guess, matrix) == pytest.approx(compute_entropy(words, guess), abs=1e-9)
+
+
+def test_filters_match_generate_feedback(words, matrix):
+    for guess, feedback in filter_cases(words, len(words)):
+        expected = [word for word in words if generate_feedback(guess, word) == feedback]
+        assert filter_candidates(words, guess, feedback, matrix) == expected
+        assert filter_candidates(words, guess, feedback) == expected
+
+
+def test_top_entropy_words_match_reference(words, matrix):
+    if len(words) > REFERENCE_RANKING_MAX:
+        pytest.skip("reference ranking is O(n^2)")
+    entropies = [compute_entropy(words, word) for word in words]
+    order = sorted(range(len(words)), key=lambda i: -entropies[i])[:10]
+    get_ranking_cache().clear()
+    assert [word for word, _ in get_top_entropy_words(words, 10, matrix)] == [words[i] for i in order]
+
+
+def test_generate_feedback(benchmark, words):
+    rng = random.Random(0)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(FEEDBACK_PAIRS)]
+    benchmark(lambda: [generate_feedback(g, s) for g, s in pairs])
+
+
+def test_pattern_codes(benchmark, words):
+    benchmark(compute_pattern_codes, words[:CODE_GUESSES], words)
+
+
+def test_compute_entropy(benchmark, words):
+    guesses = random.Random(0).sample(words, REFERENCE_ENTROPY_GUESSES)
+    benchmark(lambda: [compute_entropy(words, g) for g in guesses])
+
+
+def test_compute_entropy_matrix(benchmark, words, matrix):
+    guesses = random.Random(0).sample(words, min(len(words), ENTROPY_GUESSES))
+    benchmark(lambda: [compute_entropy(words, g, matrix) for g in guesses])
+
+
+def test_filter_matrix(benchmark, words, matrix):
+    cases = filter_cases(words)
+    benchmark(lambda: [filter_candidates(words, g, fb, matrix) for g, fb in cases])
+
+
+def test_filter_constraints(benchmark, words):
+    cases = filter_cases(words)
+    benchmark(lambda: [filter_candidates(words, g, fb) for g, fb in cases])
+
+
+def test_filter_sql(benchmark, words):
+    cases = filter_cases(words)
+    connection = sqlite_words(words)
+    benchmark(lambda: [sql_filter(connection, g, fb) for g, fb in cases])
+
+
+def test_get_top_entropy_words(benchmark, words, matrix):
+    cache = get_ranking_cache()
+
+    def top_words():
+        cache.clear()  # time the ranking, not the cache
+        return get_top_entropy_words(words, 10, matrix)
+
+    # Record the guesses the bounded search actually evaluates (outside the timing)
+    was_enabled = instrumentation.enabled()
+    instrumentation.enable()
+    instrumentation.reset()
+    try:
+        top_words()
+        counters = instrumentation.snapshot()['counters']
+    finally:
+        instrumentation.reset()
+        if not was_enabled:
+            instrumentation.disable()
+    benchmark.extra_info['guesses'] = len(words)
+    benchmark.extra_info['guesses_evaluated'] = counters.get('guesses_evaluated', len(words))
+
+    benchmark(top_words)
@@ -0,0 +1,51 @@
+"""
+Property tests for the feedback engines against generate_feedback.
+
+Hypothesis draws (guess, solution) pairs over a small alphabet, so repeated
+letters, the case generate_feedback's greedy rule exists for, come up
+constantly; a failing pair is shrunk to a minimal one. verify_feedback.py
+runs the same comparison exhaustively over the dictionary.
+
+Usage:
+    pip install -r requirements-dev.txt
+    python -m pytest test_feedback.py
+"""
+
+from hypothesis import given, strategies as st
+
+from constraints import ConstraintIndex, Constraints
+from entropy import generate_feedback
+from feedback import decode_feedback, encode_feedback, feedback_code
+from pattern_matrix import compute_pattern_codes
+from verify_feedback import verify_generated
+
+words = st.text(alphabet="aabcdee", min_size=5, max_size=5)
+
+
+@given(words, words)
+def test_feedback_code_matches_generate_feedback(guess, solution):
+    assert feedback_code(guess, solution) == encode_feedback(generate_feedback(guess, solution))
+
+
+@given(words, words)
+def test_encode_decode_round_trip(guess, solution):
+    feedback = generate_feedback(guess, solution)
+    assert decode_feedback(encode_feedback(feedback)) == feedback
+
+
+@given(words, st.lists(words, min_size=1, max_size=20))
+def test_pattern_codes_match_generate_feedback(guess, solutions):
+    codes = compute_pattern_codes([guess], solutions)
+    assert codes[0].tolist() == [encode_feedback(generate_feedback(guess, s)) for s in solutions]
+
+
+@given(words, words, st.lists(words, min_size=1, max_size=20))
+def test_constraint_index_matches_generate_feedback(guess, solution, candidates):
+    feedback = generate_feedback(guess, solution)
+    mask = ConstraintIndex(candidates).mask(Constraints().add(guess, feedback))
+    assert mask.tolist() == [generate_feedback(guess, word) == feedback for word in candidates]
+
+
+def test_verify_generated_finds_no_mismatches():
+    results = verify_generated(50, ('feedback_code', 'pattern_codes', 'constraints'))
+    assert all(mismatches == 0 for mismatches, _ in results.values())
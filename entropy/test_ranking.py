@@ -0,0 +1,145 @@
+"""
+Tests for the branch-and-bound top-N search in ranking.py.
+
+bounded_top_n must return exactly what an exhaustive ranking does (the same
+positions in the same order, ties included), and entropy_upper_bounds must
+never undercut a guess's real entropy. Word lists are random words over a
+small alphabet, so duplicate patterns, exact ties and perfect splits are
+common.
+
+Usage:
+    pip install -r requirements-dev.txt
+    python -m pytest test_ranking.py
+"""
+
+import numpy as np
+import pytest
+
+from pattern_matrix import compute_pattern_codes, encode_words
+from ranking import _binary_entropy, batch_entropies, bounded_top_n, entropy_upper_bounds, top_n_indices
+
+
+def random_words(rng, count, alphabet='abcdeirst'):
+    letters = rng.choice(list(alphabet), size=(count, 5))
+    return ["".join(row) for row in letters]
+
+
+def exhaustive_top_n(codes, guess_idx, solution_idx, n):
+    entropies = batch_entropies(codes, guess_idx, solution_idx)
+    positions = top_n_indices(entropies, n)
+    return positions, entropies[positions]
+
+
+def reference_upper_bounds(guess_letters, solution_letters):
+    """The bound evaluated letter by letter for each guess (no shared table)."""
+    total = len(solution_letters)
+    bounds = np.zeros(len(guess_letters))
+    for g, word in enumerate(guess_letters):
+        for i, letter in enumerate(word):
+            p = np.mean(solution_letters[:, i] == letter)
+            y = np.mean((solution_letters == letter).any(axis=1)) - p
+            q = min(y / (1 - p), 0.5) if p < 1 else 0.0
+            bounds[g] += _binary_entropy(np.array(p)) + (1 - p) * _binary_entropy(np.array(q))
+    return np.minimum(bounds, np.log2(total))
+
+
+@pytest.fixture(scope='module')
+def matrix():
+    rng = np.random.default_rng(0)
+    guesses = random_words(rng, 300)
+    # Repeated guesses tie exactly with each other
+    guesses += guesses[:40]
+    rng.shuffle(guesses)
+    solutions = guesses[::3]
+    return encode_words(guesses), encode_words(solutions), compute_pattern_codes(guesses, solutions)
+
+
+def candidate_sets(solution_count, seed=1):
+    rng = np.random.default_rng(seed)
+    sizes = [1, 2, 3, 5, 8, 13, 40, solution_count]
+    return [np.sort(rng.choice(solution_count, size, replace=False)) for size in sizes for _ in range(3)]
+
+
+def test_upper_bounds_cover_entropies(matrix):
+    guess_letters, solution_letters, codes = matrix
+    guess_idx = np.arange(len(guess_letters))
+    for solution_idx in candidate_sets(len(solution_letters)):
+        bounds = entropy_upper_bounds(guess_letters, solution_letters[solution_idx])
+        entropies = batch_entropies(codes, guess_idx, solution_idx)
+        assert np.all(bounds >= entropies - 1e-9)
+
+
+def test_upper_bounds_match_per_guess_reference(matrix):
+    guess_letters, solution_letters, _ = matrix
+    for solution_idx in candidate_sets(len(solution_letters))[::4]:
+        candidates = solution_letters[solution_idx]
+        np.testing.assert_allclose(entropy_upper_bounds(guess_letters, candidates),
+                                   reference_upper_bounds(guess_letters, candidates), atol=1e-12)
+
+
+@pytest.mark.parametrize('n', [1, 3, 10])
+@pytest.mark.parametrize('chunk_size', [4, 64])
+def test_bounded_matches_exhaustive(matrix, n, chunk_size):
+    guess_letters, solution_letters, codes = matrix
+    guess_idx = np.arange(len(guess_letters))
+    for solution_idx in candidate_sets(len(solution_letters)):
+        bounds = entropy_upper_bounds(guess_letters, solution_letters[solution_idx])
+        positions, entropies, stats = bounded_top_n(codes, guess_idx, solution_idx, bounds, n, chunk_size)
+
+        expected_positions, expected_entropies = exhaustive_top_n(codes, guess_idx, solution_idx, n)
+        np.testing.assert_array_equal(positions, expected_positions)
+        np.testing.assert_array_equal(entropies, expected_entropies)
+        assert stats['evaluated'] + stats['pruned'] == len(guess_idx)
+
+
+def test_bounded_matches_exhaustive_with_any_upper_bounds(matrix):
+    # Any valid upper bound must give the same result; jittered exact
+    # entropies reorder the scan so that later guesses come first
+    guess_letters, solution_letters, codes = matrix
+    guess_idx = np.arange(len(guess_letters))
+    rng = np.random.default_rng(4)
+    for solution_idx in candidate_sets(len(solution_letters), seed=5):
+        entropies = batch_entropies(codes, guess_idx, solution_idx)
+        for slack in (0.0, 0.05, 1.0):
+            bounds = entropies + rng.uniform(0, slack, len(entropies))
+            for n in (1, 4):
+                positions, _, _ = bounded_top_n(codes, guess_idx, solution_idx, bounds, n, 4)
+                expected_positions, _ = exhaustive_top_n(codes, guess_idx, solution_idx, n)
+                np.testing.assert_array_equal(positions, expected_positions)
+
+
+def test_bounded_breaks_ties_by_position(matrix):
+    guess_letters, solution_letters, codes = matrix
+    rng = np.random.default_rng(2)
+    for solution_idx in candidate_sets(len(solution_letters), seed=3):
+        # Candidates-first pools (like the cheater's) and shuffled pools with repeats
+        for guess_idx in (np.concatenate([solution_idx, np.arange(len(guess_letters))]),
+                          rng.permutation(np.repeat(np.arange(0, len(guess_letters), 7), 2))):
+            bounds = entropy_upper_bounds(guess_letters[guess_idx], solution_letters[solution_idx])
+            positions, _, _ = bounded_top_n(codes, guess_idx, solution_idx, bounds, 5, 8)
+            expected_positions, _ = exhaustive_top_n(codes, guess_idx, solution_idx, 5)
+            np.testing.assert_array_equal(positions, expected_positions)
+
+
+def test_perfect_splits_prune_later_guesses(matrix):
+    guess_letters, solution_letters, codes = matrix
+    guess_idx = np.arange(len(guess_letters))
+    solution_idx = np.arange(2)
+    entropies = batch_entropies(codes, guess_idx, solution_idx)
+    assert (entropies == 1.0).sum() > 1
+
+    bounds = entropy_upper_bounds(guess_letters, solution_letters[solution_idx])
+    positions, _, stats = bounded_top_n(codes, guess_idx, solution_idx, bounds, 1, 4)
+    assert positions[0] == np.flatnonzero(entropies == 1.0)[0]
+    assert stats['pruned'] > 0
+
+
+def test_bounded_returns_nothing_for_n_zero(matrix):
+    guess_letters, solution_letters, codes = matrix
+    guess_idx = np.arange(len(guess_letters))
+    solution_idx = np.arange(10)
+    bounds = entropy_upper_bounds(guess_letters, solution_letters[solution_idx])
+    for n in (0, -1):
+        positions, entropies, stats = bounded_top_n(codes, guess_idx, solution_idx, bounds, n)
+        assert len(positions) == len(entropies) == 0
+        assert stats == {'evaluated': 0, 'pruned': len(guess_idx)}
@@ -0,0 +1,266 @@
+"""
+Feedback-Correctness Oracle
+
+Checks every alternative feedback or filtering engine against the reference
+generate_feedback, including its greedy duplicate-letter handling, so a
+faster path can be adopted safely. Two kinds of engine are checked:
+
+- code engines produce a pattern code per (guess, solution) pair:
+  feedback_code, the vectorized pattern_codes and the cached pattern matrix
+- filter engines pick the solutions matching a (guess, feedback) pair: the
+  constraint index (constraints.py) and the cheater's SQL conditions
+  (build_sql_from_feedback, run on an in-memory sqlite table)
+
+The sweep covers the full word x word space (or a sample of guesses) in
+chunks spread over a process pool. With hypothesis installed, generated
+words over a small alphabet stress repeated letters further (hypothesis is
+a dev dependency: pip install -r requirements-dev.txt). Mismatches are
+reported with examples; any outside the SQL engine (which is known to
+disagree on repeated letters) make the run exit non-zero.
+
+Usage:
+    python verify_feedback.py --workers 8
+    python verify_feedback.py --guesses 500 --engines constraints sql
+    python verify_feedback.py --hypothesis 5000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from constraints import ConstraintIndex, Constraints
+from entropy import generate_feedback
+from feedback import decode_feedback, encode_feedback, feedback_code
+from pattern_matrix import compute_pattern_codes, load_pattern_matrix
+from word_store import get_word_store
+from wordle_cheater import build_sql_from_feedback
+
+CODE_ENGINES = ('feedback_code', 'pattern_codes', 'matrix')
+FILTER_ENGINES = ('constraints', 'sql')
+
+# The SQL conditions are slow and known to mishandle repeated letters; opt in
+DEFAULT_ENGINES = ('feedback_code', 'pattern_codes', 'matrix', 'constraints')
+
+# Guesses per task handed to a worker
+GUESSES_PER_TASK = 64
+
+# Mismatches kept per engine (all are counted)
+MAX_EXAMPLES = 20
+
+
+def pattern_string(code):
+    """Compact pattern for reports: G(reen), Y(ellow), -(gray)."""
+    return "".join({"Green": "G", "Yellow": "Y", "Gray": "-"}[name] for name in decode_feedback(code))
+
+
+def reference_codes(guesses, solutions):
+    """(G, S) pattern codes from generate_feedback (the oracle)."""
+    return np.array(
+        [[encode_feedback(generate_feedback(guess, solution)) for solution in solutions] for guess in guesses],
+        dtype=np.uint8,
+    ).reshape(len(guesses), len(solutions))
+
+
+def sql_filter(connection, guess, code):
+    """Words matching the cheater's SQL conditions for one guess and pattern."""
+    conditions = build_sql_from_feedback(guess, decode_feedback(code))
+    # SUBSTRING is MySQL; sqlite spells it SUBSTR
+    where = " AND ".join(conditions).replace("SUBSTRING(", "SUBSTR(")
+    query = "SELECT word FROM words" + (f" WHERE {where}" if where else "")
+    return {row[0] for row in connection.execute(query)}
+
+
+class Oracle:
+    """Compares engines against generate_feedback for one solution list."""
+
+    def __init__(self, solutions, engines=DEFAULT_ENGINES, matrix=None):
+        unknown = set(engines) - set(CODE_ENGINES) - set(FILTER_ENGINES)
+        if unknown:
+            raise ValueError(f"Unknown engines: {', '.join(sorted(unknown))}")
+
+        self.solutions = list(solutions)
+        self.engines = list(engines)
+        self.matrix = matrix
+        self.index = ConstraintIndex(self.solutions) if 'constraints' in engines else None
+        self.connection = None
+        if 'sql' in engines:
+            self.connection = sqlite3.connect(':memory:')
+            self.connection.execute("CREATE TABLE words (word TEXT)")
+            self.connection.executemany("INSERT INTO words (word) VALUES (?)", [(w,) for w in self.solutions])
+
+    def _engine_codes(self, engine, guesses):
+        if engine == 'feedback_code':
+            return np.array([[feedback_code(g, s) for s in self.solutions] for g in guesses], dtype=np.uint8)
+        if engine == 'pattern_codes':
+            return compute_pattern_codes(guesses, self.solutions)
+        if engine == 'matrix':
+            return self.matrix.submatrix(guesses, self.solutions)
+        raise ValueError(engine)
+
+    def _filtered(self, engine, guess, code):
+        """Boolean mask over solutions picked by a filter engine."""
+        if engine == 'constraints':
+            return self.index.mask(Constraints().add(guess, code))
+        picked = sql_filter(self.connection, guess, code)
+        return np.array([word in picked for word in self.solutions])
+
+    def check(self, guesses):
+        """
+        Check a block of guesses against every solution.
+
+        Returns {engine: (mismatch count, [example, ...])}; an example is
+        (guess, solution, expected pattern, got) for code engines and
+        (guess, pattern, solution, 'missing' or 'extra') for filter engines.
+        """
+        expected = reference_codes(guesses, self.solutions)
+        results = {}
+
+        for engine in self.engines:
+            mismatches, examples = 0, []
+            if engine in CODE_ENGINES:
+                got = self._engine_codes(engine, guesses)
+                for i, j in zip(*np.nonzero(got != expected)):
+                    mismatches += 1
+                    if len(examples) < MAX_EXAMPLES:
+                        examples.append((guesses[i], self.solutions[j],
+                                         pattern_string(expected[i, j]), pattern_string(got[i, j])))
+            else:
+                for i, guess in enumerate(guesses):
+                    for code in np.unique(expected[i]):
+                        wanted = expected[i] == code
+                        diff = np.flatnonzero(self._filtered(engine, guess, int(code)) != wanted)
+                        mismatches += len(diff)
+                        for j in diff[:max(0, MAX_EXAMPLES - len(examples))]:
+                            examples.append((guess, pattern_string(code), self.solutions[j],
+                                             'missing' if wanted[j] else 'extra'))
+            results[engine] = (mismatches, examples)
+
+        return results
+
+
+def merge_results(results, engines):
+    """Combine per-task {engine: (count, examples)} dicts."""
+    merged = {engine: [0, []] for engine in engines}
+    for result in results:
+        for engine, (count, examples) in result.items():
+            merged[engine][0] += count
+            merged[engine][1].extend(examples[:MAX_EXAMPLES - len(merged[engine][1])])
+    return {engine: tuple(value) for engine, value in merged.items()}
+
+
+# Per-worker oracle set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(solutions, engines, all_words):
+    matrix = load_pattern_matrix(all_words, build=False) if 'matrix' in engines else None
+    _worker['oracle'] = Oracle(solutions, engines, matrix)
+
+
+def _check_block(guesses):
+    return _worker['oracle'].check(guesses)
+
+
+def verify_words(guesses, solutions, engines=DEFAULT_ENGINES, workers=1):
+    """Check every (guess, solution) pair. Returns {engine: (mismatches, examples)}."""
+    all_words = sorted(set(guesses) | set(solutions))
+    if 'matrix' in engines:
+        load_pattern_matrix(all_words)  # build once before the workers attach
+
+    blocks = [guesses[i:i + GUESSES_PER_TASK] for i in range(0, len(guesses), GUESSES_PER_TASK)]
+    if workers <= 1:
+        _init_worker(solutions, engines, all_words)
+        results = [_check_block(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(solutions, engines, all_words)) as pool:
+            results = list(pool.map(_check_block, blocks))
+    return merge_results(results, engines)
+
+
+def verify_generated(examples, engines=DEFAULT_ENGINES, alphabet="aabcdee", seed=0):
+    """
+    Check generated words over a small alphabet, rich in repeated letters.
+
+    Generated by hypothesis, with seed fixing the run. A mismatch in any
+    engine but the SQL one fails the hypothesis test, so the guess is
+    shrunk and only the minimal failing guess is reported. The matrix
+    engine is skipped (it only covers dictionary words). Returns
+    {engine: (mismatches, examples)}.
+
+    Raises:
+        ImportError: hypothesis is not installed
+    """
+    from hypothesis import given, seed as hypothesis_seed, settings, strategies as st
+
+    engines = [engine for engine in engines if engine != 'matrix']
+    letters = sorted(set(alphabet))
+    words = ["".join(combo) for combo in itertools.product(letters, repeat=5)]
+    oracle = Oracle(words, engines)
+
+    results = []
+
+    @hypothesis_seed(seed)
+    @settings(max_examples=examples, deadline=None, database=None)
+    @given(st.text(alphabet=alphabet, min_size=5, max_size=5))
+    def check_guess(guess):
+        result = oracle.check([guess])
+        results.append(result)
+        failing = [engine for engine, (mismatches, _) in result.items() if mismatches and engine != 'sql']
+        assert not failing, f"{guess}: {', '.join(failing)} disagree with generate_feedback"
+
+    try:
+        check_guess()
+    except AssertionError:
+        # Hypothesis replays the shrunk example last before re-raising
+        return merge_results(results[-1:], engines)
+    return merge_results(results, engines)
+
+
+def print_report(title, results):
+    print(f"\n{title}")
+    for engine, (mismatches, examples) in results.items():
+        print(f"  {engine:<14} {'ok' if not mismatches else f'{mismatches} mismatches'}")
+        for example in examples:
+            print(f"      {' '.join(str(part) for part in example)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify feedback and filtering engines against generate_feedback")
+    parser.add_argument('--engines', nargs='+', choices=CODE_ENGINES + FILTER_ENGINES, default=list(DEFAULT_ENGINES))
+    parser.add_argument('--guesses', type=int, help="check a random sample of this many guesses (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--hypothesis', type=int, default=0, metavar='N',
+                        help="also check N generated guesses over a small alphabet")
+    args = parser.parse_args()
+
+    if args.hypothesis:
+        try:
+            import hypothesis  # noqa: F401
+        except ImportError:
+            sys.exit("--hypothesis needs the hypothesis package (pip install -r requirements-dev.txt)")
+
+    words = sorted(get_word_store().all_words())
+    guesses = words
+    if args.guesses:
+        guesses = sorted(random.Random(args.seed).sample(words, min(args.guesses, len(words))))
+
+    start = time.perf_counter()
+    results = verify_words(guesses, words, args.engines, args.workers)
+    print_report(f"{len(guesses)} x {len(words)} dictionary pairs ({time.perf_counter() - start:.1f}s)", results)
+    failed = any(mismatches for engine, (mismatches, _) in results.items() if engine != 'sql')
+
+    if args.hypothesis:
+        generated = verify_generated(args.hypothesis, args.engines, seed=args.seed)
+        print_report(f"{args.hypothesis} generated guesses", generated)
+        failed = failed or any(mismatches for engine, (mismatches, _) in generated.items() if engine != 'sql')
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,225 @@
+"""
+Word Store for the Entropy Tools
+
+One interface over the words table with two backends:
+
+- CsvWordStore loads the shipped snapshots (scripts/words_by_score.csv and
+  data/word_ranking_by_frequency.csv) once into compact arrays, so the
+  entropy tools and the cheater run with no database at all. The NYT
+  solution list is read from scripts/create_nyt_words_table.sql. The
+  columnar export (export_words_by_score.py --format npy, one .npy per
+  column in a directory) can stand in for the words CSV: its columns are
+  memory-mapped instead of parsed.
+- MySQLWordStore reads the live words table through a pooled connection
+  instead of opening a new connection per query.
+
+Pick the backend with the WORD_STORE environment variable ("csv", the
+default, or "mysql"), or construct one directly. WORDS_FILE points the csv
+backend at another words CSV or npy export directory.
+"""
+
+import csv
+import os
+import random
+import re
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+from instrumentation import count, span, timed
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Load .env from project root
+load_dotenv(PROJECT_ROOT / '.env')
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'database': os.getenv('DB_NAME', 'wordleapp')
+}
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '4'))
+
+WORDS_CSV = Path(os.getenv('WORDS_FILE', PROJECT_ROOT / 'scripts' / 'words_by_score.csv'))
+RANKING_CSV = PROJECT_ROOT / 'data' / 'word_ranking_by_frequency.csv'
+NYT_WORDS_SQL = PROJECT_ROOT / 'scripts' / 'create_nyt_words_table.sql'
+
+# Same threshold the game uses when picking solutions
+SOLUTION_MIN_FREQUENCY = 20
+
+_pool = None
+_stores = {}
+
+
+def get_connection_pool():
+    """Create (once) and return the shared MySQL connection pool."""
+    global _pool
+    if _pool is None:
+        from mysql.connector import pooling
+
+        _pool = pooling.MySQLConnectionPool(
+            pool_name='entropy',
+            pool_size=DB_POOL_SIZE,
+            **DB_CONFIG
+        )
+    return _pool
+
+
+class CsvWordStore:
+    """Word list, frequencies and scores loaded from the shipped CSV snapshots (or an npy export)."""
+
+    @timed('word_store_load')
+    def __init__(self, words_csv=WORDS_CSV, ranking_csv=RANKING_CSV, nyt_sql=NYT_WORDS_SQL):
+        self.nyt_sql = nyt_sql
+
+        if Path(words_csv).is_dir():
+            self._load_npy(words_csv)
+        else:
+            self._load_csv(words_csv)
+        self.index = {word: i for i, word in enumerate(self.words)}
+
+        # Frequency rank (1 = most common); 0 for words missing from the ranking
+        self.ranks = np.zeros(len(self.words), dtype=np.int32)
+        if ranking_csv and Path(ranking_csv).exists():
+            with open(ranking_csv, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    i = self.index.get(row['word'].lower())
+                    if i is not None:
+                        self.ranks[i] = int(row['word_rank'])
+
+    def _load_csv(self, path):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = sorted(csv.DictReader(f), key=lambda row: int(row['id']))
+
+        self.words = [row['word'].lower() for row in rows]
+        self.ids = np.array([int(row['id']) for row in rows], dtype=np.int32)
+        self.frequencies = np.array([int(row['frequency']) for row in rows], dtype=np.int64)
+        self.scores = np.array([float(row['score']) for row in rows], dtype=np.float32)
+
+    def _load_npy(self, directory):
+        """Read the one-.npy-per-column export written by export_words_by_score.py."""
+        columns = {name: np.load(Path(directory) / f"{name}.npy", mmap_mode='r')
+                   for name in ('id', 'word', 'frequency', 'score')}
+        order = np.argsort(columns['id'], kind='stable')
+
+        self.words = np.char.lower(columns['word'][order]).astype(str).tolist()
+        self.ids = columns['id'][order].astype(np.int32)
+        self.frequencies = columns['frequency'][order].astype(np.int64)
+        self.scores = columns['score'][order].astype(np.float32)
+
+    def all_words(self):
+        """Every word (any frequency - all valid guesses)."""
+        return list(self.words)
+
+    def solution_words(self, min_frequency=SOLUTION_MIN_FREQUENCY):
+        """Words eligible as solutions (frequency >= min_frequency)."""
+        return [self.words[i] for i in np.flatnonzero(self.frequencies >= min_frequency)]
+
+    def nyt_words(self):
+        """The NYT Wordle solution list (the nyt_words table), in insert order."""
+        with open(self.nyt_sql, encoding='utf-8') as f:
+            return [word.lower() for word in re.findall(r"\('([A-Za-z]{5})'\)", f.read())]
+
+    def contains(self, word):
+        """True if the word is in the dictionary."""
+        return word.lower() in self.index
+
+    def frequency(self, word):
+        """Corpus frequency of a word (0 if unknown)."""
+        i = self.index.get(word.lower())
+        return 0 if i is None else int(self.frequencies[i])
+
+    def score(self, word):
+        """Base score of a word (None if unknown)."""
+        i = self.index.get(word.lower())
+        return None if i is None else float(self.scores[i])
+
+    def random_solution(self, min_frequency=SOLUTION_MIN_FREQUENCY):
+        """Pick a random solution word."""
+        words = self.solution_words(min_frequency)
+        return random.choice(words) if words else None
+
+
+class MySQLWordStore:
+    """Word list read from the live words table through a pooled connection."""
+
+    def __init__(self):
+        self._all_words = None
+        self._frequencies = None
+
+    def query(self, query, params=None):
+        """Run a query on a pooled connection and return all rows."""
+        count('db_queries')
+        with span('db'):
+            connection = get_connection_pool().get_connection()
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params or ())
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+                connection.close()  # returns the connection to the pool
+
+    def _load(self):
+        if self._all_words is None:
+            rows = self.query("SELECT LOWER(word), frequency FROM words ORDER BY id")
+            self._all_words = [word for word, _ in rows]
+            self._frequencies = {word: frequency or 0 for word, frequency in rows}
+
+    def all_words(self):
+        """Every word (any frequency - all valid guesses)."""
+        self._load()
+        return list(self._all_words)
+
+    def solution_words(self, min_frequency=SOLUTION_MIN_FREQUENCY):
+        """Words eligible as solutions (frequency >= min_frequency)."""
+        self._load()
+        return [word for word in self._all_words if self._frequencies[word] >= min_frequency]
+
+    def nyt_words(self):
+        """The NYT Wordle solution list (the nyt_words table), in insert order."""
+        return [word for (word,) in self.query("SELECT LOWER(word) FROM nyt_words ORDER BY id")]
+
+    def contains(self, word):
+        """True if the word is in the dictionary."""
+        if self._all_words is not None:
+            return word.lower() in self._frequencies
+        rows = self.query("SELECT COUNT(*) FROM words WHERE LOWER(word) = %s", (word.lower(),))
+        return rows[0][0] > 0
+
+    def frequency(self, word):
+        """Corpus frequency of a word (0 if unknown)."""
+        self._load()
+        return self._frequencies.get(word.lower(), 0)
+
+    def score(self, word):
+        """Base score of a word (None if unknown)."""
+        rows = self.query("SELECT score FROM words WHERE LOWER(word) = %s", (word.lower(),))
+        return float(rows[0][0]) if rows else None
+
+    def random_solution(self, min_frequency=SOLUTION_MIN_FREQUENCY):
+        """Pick a random solution word."""
+        rows = self.query(
+            "SELECT LOWER(word) FROM words WHERE frequency >= %s ORDER BY RAND() LIMIT 1",
+            (min_frequency,),
+        )
+        return rows[0][0] if rows else None
+
+
+BACKENDS = {
+    'csv': CsvWordStore,
+    'mysql': MySQLWordStore,
+}
+
+
+def get_word_store(backend=None):
+    """Return the shared word store for a backend (default: WORD_STORE env var, else csv)."""
+    backend = (backend or os.getenv('WORD_STORE', 'csv')).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown word store '{backend}' (choose from {', '.join(BACKENDS)})")
+    if backend not in _stores:
+        _stores[backend] = BACKENDS[backend]()
+    return _stores[backend]
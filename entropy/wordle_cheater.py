@@ -3,18 +3,26 @@
 Wordle Cheater - Terminal Edition
 
 A standalone terminal game that helps you cheat at Wordle using entropy calculations.
-Uses SQL-based filtering to narrow down candidates based on feedback.
+Narrows down candidates incrementally with a SolverState (see
+solver_state.py) over the precomputed pattern matrix.
 
 Usage:
-    python wordle_cheater.py
+    python wordle_cheater.py [--hard-mode strict|nyt] [--profile] [--profile-out FILE]
 """
 
+import argparse
 import random
 from entropy import (
-    fetch_words_from_db,
+    fetch_all_words,
     generate_feedback,
-    get_top_entropy_words,
 )
+from constraints import HARD_MODES
+from feedback import as_feedback_tuple
+import instrumentation
+from solver_state import SolverState
+from word_store import get_word_store
+from opener_table import load_opener_table
+from pattern_matrix import load_pattern_matrix
 
 # ANSI color codes for terminal output
 GREEN = "\033[92m"
@@ -26,9 +34,13 @@ CYAN = "\033[96m"
 
 
 def colorize_feedback(guess, feedback):
-    """Return a colorized string showing the guess with feedback colors."""
+    """
+    Return a colorized string showing the guess with feedback colors.
+
+    Feedback may be a tuple of ("Green", "Yellow", "Gray") or a pattern code.
+    """
     result = ""
-    for letter, fb in zip(guess.upper(), feedback):
+    for letter, fb in zip(guess.upper(), as_feedback_tuple(feedback)):
         if fb == "Green":
             result += f"{GREEN}{BOLD}{letter}{RESET}"
         elif fb == "Yellow":
@@ -80,41 +92,27 @@ def build_sql_from_feedback(guess, feedback, existing_conditions=None):
     return conditions
 
 
-def fetch_candidates_with_sql(conditions):
-    """Fetch candidate words from DB using SQL conditions."""
-    base_query = "SELECT LOWER(word) FROM words"
-
-    if conditions:
-        where_clause = " AND ".join(conditions)
-        query = f"{base_query} WHERE {where_clause}"
-    else:
-        query = base_query
+def fetch_random_solution():
+    """Pick a single random word (frequency >= 20) to be the solution."""
+    return get_word_store().random_solution()
 
-    return fetch_words_from_db(query)
 
+def check_word_exists(word):
+    """Check if a word is in the dictionary (any frequency - valid guess)."""
+    return get_word_store().contains(word)
 
-def fetch_random_solution():
-    """Fetch a single random word to be the solution."""
-    query = "SELECT LOWER(word) FROM words WHERE frequency >= 20 ORDER BY RAND() LIMIT 1"
-    words = fetch_words_from_db(query)
-    return words[0] if words else None
 
+def print_suggestions(state, attempt_num, opener_table=None):
+    """
+    Print top entropy suggestions for a SolverState.
 
-def check_word_exists(word):
-    """Check if a word exists in the database (any frequency - valid guess)."""
-    query = f"SELECT COUNT(*) as cnt FROM words WHERE LOWER(word) = '{word}'"
-    from entropy import get_db_connection
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query)
-    result = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return result[0] > 0
-
-
-def print_suggestions(candidates, attempt_num):
-    """Print top entropy suggestions."""
+    Suggestions are drawn from the state's allowed guesses, so a
+    non-candidate probe word can be suggested when it splits the candidates
+    better. The first two turns are answered from opener_table when it
+    covers the guesses in the state's history (only the first in hard mode,
+    where the table's second guesses may break the rules).
+    """
+    candidates = state.candidate_words
     print(f"\n{CYAN}--- Attempt {attempt_num}/6 | {len(candidates)} candidates remaining ---{RESET}")
 
     if len(candidates) <= 20:
@@ -129,15 +127,26 @@ def print_suggestions(candidates, attempt_num):
         return
 
     print(f"\n{BOLD}Top 10 guesses by entropy:{RESET}")
-    print(f"  {GRAY}(calculating...){RESET}", end="\r")
-    top_words = get_top_entropy_words(candidates, min(10, len(candidates)))
-    print(f"                      ", end="\r")  # Clear
+    use_table = opener_table is not None and (state.hard_constraints is None or not state.history)
+    top_words = opener_table.lookup(state.history) if use_table else None
+    if top_words is None:
+        print(f"  {GRAY}(calculating...){RESET}", end="\r")
+        top_words = state.top_guesses(10)
+        print(f"                      ", end="\r")  # Clear
+    candidate_set = set(candidates)
     for i, (word, entropy) in enumerate(top_words, 1):
-        print(f"  {i:2}. {word.upper()}  ({entropy:.3f} bits)")
+        probe = "" if word in candidate_set else f"  {GRAY}(probe){RESET}"
+        print(f"  {i:2}. {word.upper()}  ({entropy:.3f} bits){probe}")
 
 
-def get_user_guess(solution=None):
-    """Get a valid guess from the user."""
+def print_profile(title):
+    """Print (and reset) the per-stage timing breakdown when profiling is on."""
+    if instrumentation.enabled():
+        print(f"\n{GRAY}{instrumentation.format_report(instrumentation.take_report(), title)}{RESET}")
+
+
+def get_user_guess(solution=None, state=None):
+    """Get a valid guess from the user (one the state allows, in hard mode)."""
     while True:
         guess = input(f"\n{BOLD}Enter your guess ('q' quit, '!reveal' to cheat): {RESET}").strip().lower()
 
@@ -156,28 +165,46 @@ def get_user_guess(solution=None):
             print("  Word not in dictionary. Try again.")
             continue
 
+        if state is not None and not state.allows(guess):
+            print("  Hard mode: revealed hints must be used. Try again.")
+            continue
+
         return guess
 
 
-def play_game():
-    """Main game loop. Returns True if game completed, False if quit early."""
+def play_game(hard_mode=None):
+    """
+    Main game loop. Returns True if game completed, False if quit early.
+
+    With hard_mode ('strict' or 'nyt') guesses and suggestions must use the
+    revealed hints.
+    """
     print_header()
 
-    # Pick a random solution (single query, no loading full list)
+    # Pick a random solution from the word store
     solution = fetch_random_solution()
     if not solution:
-        print("Error: Could not fetch a word from database.")
+        print("Error: Could not fetch a word from the word store.")
         return False
 
-    sql_conditions = []
+    # Every dictionary word is a valid guess; precompute feedback for all pairs
+    all_words = fetch_all_words()
+    matrix = load_pattern_matrix(all_words)
+    opener_table = load_opener_table(all_words, matrix=matrix)
+
+    state = SolverState(matrix, all_words, all_words, hard_mode=hard_mode)
     attempts = []
 
     print(f"{BOLD}A random word has been selected. Let's cheat!{RESET}")
     print(f"(Type '!reveal' to see the answer)")
 
+    # Opening suggestions come straight from the precomputed table
+    print_suggestions(state, 1, opener_table)
+    print_profile("Setup + turn 1 profile")
+
     for attempt_num in range(1, 7):
-        # Get user's guess FIRST (before showing suggestions)
-        guess = get_user_guess(solution)
+        # Get the user's guess (suggestions for it were shown above)
+        guess = get_user_guess(solution, state)
         if guess is None:
             print(f"\n{YELLOW}Quitting... The word was: {solution.upper()}{RESET}")
             return False
@@ -196,12 +223,10 @@ def play_game():
             print(f"{GREEN}{BOLD}{'=' * 50}{RESET}")
             break
 
-        # Build SQL conditions from this feedback
-        sql_conditions = build_sql_from_feedback(guess, feedback, sql_conditions)
-
-        # NOW fetch and show suggestions for next guess
-        candidates = fetch_candidates_with_sql(sql_conditions)
-        print_suggestions(candidates, attempt_num + 1)
+        # NOW narrow the candidates and show suggestions for next guess
+        state.apply(guess, feedback)
+        print_suggestions(state, attempt_num + 1, opener_table)
+        print_profile(f"Turn {attempt_num + 1} profile")
 
     else:
         # Used all 6 attempts without winning
@@ -217,16 +242,27 @@ def play_game():
     return True
 
 
-def main():
+def main(hard_mode=None):
     """Entry point."""
-    completed = play_game()
+    completed = play_game(hard_mode)
 
     if completed:
         print()
         again = input("Play again? (y/n): ").strip().lower()
         if again == 'y':
-            main()
+            main(hard_mode)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Cheat at Wordle in the terminal")
+    parser.add_argument('--hard-mode', choices=HARD_MODES,
+                        help="strict: guesses must fit all feedback; nyt: reuse revealed hints")
+    parser.add_argument('--profile', action='store_true',
+                        help="print a per-turn timing breakdown (same as WORDLE_PROFILE=1)")
+    parser.add_argument('--profile-out', help="write cProfile/pstats output to this file")
+    args = parser.parse_args()
+
+    if args.profile:
+        instrumentation.enable()
+    with instrumentation.profiling(args.profile_out):
+        main(args.hard_mode)
@@ -12,9 +12,38 @@ The curve follows a sigmoid/logistic shape (similar to -tan(x)):
 - 5-6 attempts give diminishing returns (penalty)
 
 Final score = word_base_score * attempt_multiplier
+
+calculate_final_scores() scores whole arrays of games in one vectorized call
+and iter_final_scores() does the same for game rows streamed in chunks (for
+leaderboard recomputation over the full history). check_golden() proves the
+batch path matches wordle-backend/utils/scoring.js on the golden table in
+scoring_golden.csv (regenerate it with --write-golden; needs node).
+
+Usage:
+    python attempt_scoring.py
+    python attempt_scoring.py --check-golden
+    python attempt_scoring.py --check-golden --node
 """
 
+import argparse
+import csv
+import itertools
+import json
 import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+SCORING_JS = Path(__file__).parent.parent / "wordle-backend" / "utils" / "scoring.js"
+GOLDEN_FILE = Path(__file__).parent / "scoring_golden.csv"
+
+# Base score the backend uses when a word is missing from the words table
+DEFAULT_BASE_SCORE = 5.0
+
+# Game rows per chunk in streaming mode
+CHUNK_SIZE = 100000
 
 
 def get_attempt_multiplier(attempts: int) -> float:
@@ -88,6 +117,109 @@ def calculate_final_score(word_base_score: float, attempts: int) -> int:
     return math.ceil(raw_score)
 
 
+# MULTIPLIER_LUT[attempts] for attempts clipped to 1-6 (index 0 unused)
+MULTIPLIER_LUT = np.array([get_attempt_multiplier(1)] + [get_attempt_multiplier(i) for i in range(1, 7)])
+
+
+def calculate_final_scores(word_base_scores, attempts) -> np.ndarray:
+    """
+    Vectorized calculate_final_score over arrays of games.
+
+    Same float64 arithmetic as the scalar (and JS) version, so results are
+    identical element for element.
+
+    Args:
+        word_base_scores: Array-like of base scores (1.0 - 10.0)
+        attempts: Array-like of integer guess counts (clipped to 1-6)
+
+    Returns:
+        int64 array of final scores
+    """
+    base = np.asarray(word_base_scores, dtype=np.float64)
+    index = np.clip(np.asarray(attempts, dtype=np.int64), 1, 6)
+    return np.ceil(base * MULTIPLIER_LUT[index]).astype(np.int64)
+
+
+def iter_final_scores(rows, chunk_size=CHUNK_SIZE):
+    """
+    Score (word_base_score, attempts) rows streamed in chunks.
+
+    A base score of None (word not in the words table) counts as
+    DEFAULT_BASE_SCORE, as in the backend.
+
+    Yields:
+        int64 arrays of final scores, one per chunk, in row order
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        base = np.array([DEFAULT_BASE_SCORE if row[0] is None else float(row[0]) for row in chunk])
+        attempts = np.array([int(row[1]) for row in chunk], dtype=np.int64)
+        yield calculate_final_scores(base, attempts)
+
+
+def golden_cases():
+    """
+    (base score text, attempts) pairs covered by the golden table.
+
+    Base scores run 0.0 - 10.0 in the database's 0.1 steps; attempts 0 - 7
+    include the clipped values either side of 1 - 6.
+    """
+    bases = [f"{i // 10}.{i % 10}" for i in range(0, 101)]
+    return [(base, attempts) for base in bases for attempts in range(0, 8)]
+
+
+def js_final_scores(cases):
+    """Final scores for (base text, attempts) pairs from scoring.js, via node."""
+    script = (
+        f"const {{ calculateFinalScore }} = require({json.dumps(str(SCORING_JS))});"
+        "const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "console.log(JSON.stringify(cases.map(([b, a]) => calculateFinalScore(parseFloat(b), a))));"
+    )
+    result = subprocess.run(['node', '-e', script], input=json.dumps(cases),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def write_golden(path=GOLDEN_FILE):
+    """Regenerate the golden table from scoring.js (requires node)."""
+    cases = golden_cases()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word_base_score', 'attempts', 'final_score'])
+        for (base, attempts), score in zip(cases, js_final_scores(cases)):
+            writer.writerow([base, attempts, score])
+    return len(cases)
+
+
+def check_golden(path=GOLDEN_FILE, node=False):
+    """
+    Compare the batch and scalar scorers with the golden table.
+
+    With node=True the expected scores come from running scoring.js live
+    instead of the file. Returns a list of (base, attempts, expected, batch,
+    scalar) mismatches (empty when everything matches).
+    """
+    if node:
+        cases = golden_cases()
+        expected = js_final_scores(cases)
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        cases = [(row['word_base_score'], int(row['attempts'])) for row in rows]
+        expected = [int(row['final_score']) for row in rows]
+
+    batch = calculate_final_scores([float(base) for base, _ in cases], [attempts for _, attempts in cases])
+    mismatches = []
+    for (base, attempts), want, got in zip(cases, expected, batch):
+        scalar = calculate_final_score(float(base), attempts)
+        if want != got or want != scalar:
+            mismatches.append((base, attempts, want, int(got), scalar))
+    return mismatches
+
+
 def print_multiplier_table():
     """Print a formatted table of attempt multipliers."""
     print("\n" + "=" * 50)
@@ -140,6 +272,23 @@ def print_curve_visualization():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Attempt-based scoring multipliers")
+    parser.add_argument('--check-golden', action='store_true',
+                        help="verify the batch scorer against the scoring.js golden table")
+    parser.add_argument('--node', action='store_true', help="with --check-golden, run scoring.js live")
+    parser.add_argument('--write-golden', action='store_true', help="regenerate the golden table (needs node)")
+    args = parser.parse_args()
+
+    if args.write_golden:
+        print(f"Wrote {write_golden()} cases to {GOLDEN_FILE}")
+        sys.exit(0)
+    if args.check_golden:
+        mismatches = check_golden(node=args.node)
+        for base, attempts, want, got, scalar in mismatches:
+            print(f"MISMATCH base={base} attempts={attempts}: js={want} batch={got} scalar={scalar}")
+        print(f"{len(golden_cases())} cases, {len(mismatches)} mismatches")
+        sys.exit(1 if mismatches else 0)
+
     print("=" * 50)
     print("ATTEMPT-BASED SCORING FOR WORDLE")
     print("=" * 50)
@@ -1,14 +1,36 @@
 #!/usr/bin/env python3
 """
-Export words table ordered by score (descending) to CSV.
+Export words table ordered by score (descending) to CSV, gzip CSV or .npy.
+
+Rows are streamed from an unbuffered (server-side) cursor in fetchmany
+batches and written as they arrive, so memory stays flat however large the
+table is. Output formats:
+
+- csv:  plain CSV (the default, scripts/words_by_score.csv)
+- gz:   gzip-compressed CSV
+- npy:  columnar export - a directory with one .npy array per column
+        (id.npy, word.npy, frequency.npy, score.npy); the entropy tools
+        memory-map the columns instead of parsing the CSV when WORDS_FILE
+        points at the directory (see entropy/word_store.py)
+
+With --incremental only rows that are new or changed since the previous
+incremental run are written; a checksum per row id is kept in a state file
+next to the output.
 
 Usage:
-    pip install python-dotenv mysql-connector-python
+    pip install python-dotenv mysql-connector-python numpy
     python export_words_by_score.py
+    python export_words_by_score.py --format gz --output words_by_score.csv.gz
+    python export_words_by_score.py --format npy --output words_npy
+    python export_words_by_score.py --incremental --output changed_words.csv
 """
 
 import os
 import csv
+import gzip
+import json
+import zlib
+import argparse
 import mysql.connector
 from pathlib import Path
 from dotenv import load_dotenv
@@ -26,29 +48,159 @@ DB_CONFIG = {
 
 OUTPUT_FILE = Path(__file__).parent / "words_by_score.csv"
 
+COLUMNS = ['id', 'word', 'frequency', 'score']
 
-def export_words():
-    conn = mysql.connector.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+# Array dtype of each column in the npy export
+COLUMN_DTYPES = {'id': '<i4', 'word': 'S5', 'frequency': '<i8', 'score': '<f4'}
 
+# Rows per fetchmany round trip
+FETCH_BATCH_SIZE = 5000
+
+FORMATS = ('csv', 'gz', 'npy')
+
+
+def iter_word_rows(cursor, batch_size=FETCH_BATCH_SIZE):
+    """Stream (id, word, frequency, score) rows ordered by score, batch by batch."""
     cursor.execute("""
         SELECT id, word, frequency, score
         FROM words
         ORDER BY score DESC, word ASC
     """)
 
-    rows = cursor.fetchall()
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
 
-    with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
+def row_checksum(row):
+    """Stable checksum of one exported row (for incremental exports)."""
+    return zlib.crc32("\t".join(str(value) for value in row).encode('utf-8'))
+
+
+def changed_rows(rows, previous, current):
+    """
+    Yield only rows that are new or differ from the previous run.
+
+    previous maps row id -> checksum from the last run; current is filled
+    with this run's checksums as rows stream past.
+    """
+    for row in rows:
+        checksum = row_checksum(row)
+        current[str(row[0])] = checksum
+        if previous.get(str(row[0])) != checksum:
+            yield row
+
+
+def write_csv(rows, path, compress=False):
+    """Write rows as CSV (gzip-compressed if compress). Returns the row count."""
+    opener = gzip.open if compress else open
+    count = 0
+    with opener(path, 'wt', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow(['id', 'word', 'frequency', 'score'])
-        writer.writerows(rows)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_npy(rows, directory, batch_size=FETCH_BATCH_SIZE):
+    """
+    Write rows as one .npy array per column in directory, streaming to disk.
 
-    cursor.close()
-    conn.close()
+    The row count is only known at the end, so each column goes to a
+    temporary file first and its .npy header is written in front of it.
+    Returns the row count.
+    """
+    import numpy as np
 
-    print(f"Exported {len(rows)} words to {OUTPUT_FILE}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_paths = {name: directory / f"{name}.npy.{os.getpid()}.tmp" for name in COLUMNS}
+    bodies = {name: open(path, 'wb') for name, path in tmp_paths.items()}
+
+    def flush(batch):
+        for name, values in zip(COLUMNS, zip(*batch)):
+            bodies[name].write(np.array(values, dtype=COLUMN_DTYPES[name]).tobytes())
+
+    count = 0
+    batch = []
+    try:
+        for word_id, word, frequency, score in rows:
+            batch.append((word_id, word.encode('ascii'), frequency or 0, float(score or 0)))
+            if len(batch) >= batch_size:
+                flush(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+            count += len(batch)
+    finally:
+        for body in bodies.values():
+            body.close()
+
+    for name, tmp_path in tmp_paths.items():
+        header = {'descr': COLUMN_DTYPES[name], 'fortran_order': False, 'shape': (count,)}
+        with open(directory / f"{name}.npy", 'wb') as out, open(tmp_path, 'rb') as body:
+            np.lib.format.write_array_header_1_0(out, header)
+            while True:
+                block = body.read(1 << 20)
+                if not block:
+                    break
+                out.write(block)
+        tmp_path.unlink()
+    return count
+
+
+def state_path(output):
+    return Path(f"{output}.state.json")
+
+
+def export_words(output=OUTPUT_FILE, fmt='csv', incremental=False, batch_size=FETCH_BATCH_SIZE):
+    """Stream the words table to output in the given format. Returns the rows written."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (choose from {', '.join(FORMATS)})")
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor(buffered=False)
+
+    previous, current = {}, {}
+    if incremental and state_path(output).exists():
+        with open(state_path(output), encoding='utf-8') as f:
+            previous = json.load(f)
+
+    try:
+        rows = iter_word_rows(cursor, batch_size)
+        if incremental:
+            rows = changed_rows(rows, previous, current)
+
+        if fmt == 'npy':
+            count = write_npy(rows, output, batch_size)
+        else:
+            count = write_csv(rows, output, compress=(fmt == 'gz'))
+    finally:
+        cursor.close()
+        conn.close()
+
+    if incremental:
+        with open(state_path(output), 'w', encoding='utf-8') as f:
+            json.dump(current, f)
+        removed = len(set(previous) - set(current))
+        print(f"Exported {count} new or changed words to {output} ({removed} removed since last run)")
+    else:
+        print(f"Exported {count} words to {output}")
+    return count
 
 
 if __name__ == "__main__":
-    export_words()
+    parser = argparse.ArgumentParser(description="Export the words table ordered by score")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--output', default=str(OUTPUT_FILE))
+    parser.add_argument('--incremental', action='store_true',
+                        help="only write rows new or changed since the last incremental run")
+    parser.add_argument('--batch-size', type=int, default=FETCH_BATCH_SIZE, help="rows per fetchmany")
+    args = parser.parse_args()
+
+    export_words(args.output, args.format, args.incremental, args.batch_size)
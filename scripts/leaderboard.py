@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Recomputation from Exported Game History
+
+Rebuilds per-player aggregates offline, e.g. after the attempt multiplier
+table or the word score curve changes. Game rows are streamed from a CSV or
+sqlite export with the columns
+
+    player_id, word, attempts, won, completed_at[, game_id]
+
+and scored like the backend (controllers/game.js): a won game earns
+calculate_final_score(word score, attempts), with the word score looked up
+in an in-memory index of words_by_score.csv (5.0 for unknown words); a lost
+game earns nothing.
+
+Memory stays bounded however long the history is: the main process only
+routes rows by a hash of player_id into shard files on disk, and a process
+pool aggregates one shard at a time (sorting it by completion time for the
+streaks). Raise --shards if a single shard does not fit in memory.
+
+Output is one row per player: games, wins, total_score, average_score
+(per game), average_attempts (per win), current_streak and max_streak
+(consecutive wins), ordered by total_score.
+
+Usage:
+    pip install numpy
+    python leaderboard.py games.csv --output leaderboard.csv
+    python leaderboard.py games.db --table games --workers 8 --shards 256
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from attempt_scoring import DEFAULT_BASE_SCORE, calculate_final_scores
+
+WORD_SCORES_CSV = Path(__file__).parent / "words_by_score.csv"
+OUTPUT_FILE = Path(__file__).parent / "leaderboard.csv"
+
+GAME_COLUMNS = ['player_id', 'word', 'attempts', 'won', 'completed_at', 'game_id']
+AGGREGATE_COLUMNS = ['player_id', 'games', 'wins', 'total_score', 'average_score',
+                     'average_attempts', 'current_streak', 'max_streak']
+
+DEFAULT_SHARDS = 64
+
+# Rows per fetchmany when reading a sqlite export
+FETCH_BATCH_SIZE = 10000
+
+WON_VALUES = {'1', 'true', 't', 'yes', 'y'}
+
+
+def load_word_scores(path=WORD_SCORES_CSV):
+    """In-memory index of word (upper case) -> base score."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['word'].upper(): float(row['score']) for row in csv.DictReader(f)}
+
+
+def iter_game_rows(source, table='games', batch_size=FETCH_BATCH_SIZE):
+    """
+    Stream game rows from a CSV file or a sqlite database.
+
+    Yields:
+        Lists of GAME_COLUMNS values as strings (game_id is '' when absent)
+    """
+    if Path(source).suffix.lower() in ('.db', '.sqlite', '.sqlite3'):
+        conn = sqlite3.connect(source)
+        try:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            select = ", ".join(col if col in columns else "''" for col in GAME_COLUMNS)
+            cursor = conn.execute(f"SELECT {select} FROM {table}")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield ['' if value is None else str(value) for value in row]
+        finally:
+            conn.close()
+        return
+
+    with open(source, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield [row.get(col) or '' for col in GAME_COLUMNS]
+
+
+def shard_of(player_id, shards):
+    """Stable shard number for a player (the same in every process)."""
+    return zlib.crc32(player_id.encode('utf-8')) % shards
+
+
+def write_shards(rows, directory, shards):
+    """Route game rows into per-player-hash shard files. Returns (paths, row count)."""
+    paths = [Path(directory) / f"shard-{i:04d}.csv" for i in range(shards)]
+    files = [open(path, 'w', newline='', encoding='utf-8') for path in paths]
+    writers = [csv.writer(f) for f in files]
+    count = 0
+    try:
+        for row in rows:
+            writers[shard_of(row[0], shards)].writerow(row)
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    return paths, count
+
+
+def aggregate_games(players, words, attempts, won, word_scores):
+    """
+    Aggregate one shard's games, already sorted by player and completion time.
+
+    Returns:
+        List of AGGREGATE_COLUMNS tuples, one per player
+    """
+    base = np.array([word_scores.get(word.upper(), DEFAULT_BASE_SCORE) for word in words])
+    attempts = np.array(attempts, dtype=np.int64)
+    won = np.array(won, dtype=bool) & (attempts > 0)
+    points = np.where(won, calculate_final_scores(base, attempts), 0)
+
+    results = []
+    start = 0
+    while start < len(players):
+        end = start
+        while end < len(players) and players[end] == players[start]:
+            end += 1
+
+        player_won = won[start:end]
+        wins = int(player_won.sum())
+        total = int(points[start:end].sum())
+        streak = max_streak = 0
+        for game_won in player_won.tolist():
+            streak = streak + 1 if game_won else 0
+            max_streak = max(max_streak, streak)
+
+        games = end - start
+        average_attempts = float(attempts[start:end][player_won].mean()) if wins else 0.0
+        results.append((players[start], games, wins, total, total / games,
+                        average_attempts, streak, max_streak))
+        start = end
+    return results
+
+
+# Per-worker word score index set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(word_scores_path):
+    _worker['word_scores'] = load_word_scores(word_scores_path)
+
+
+def aggregate_shard(path):
+    """Aggregate every player in one shard file."""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    # Chronological per player; game_id breaks ties within the same timestamp
+    rows.sort(key=lambda row: (row[0], row[4], int(row[5]) if row[5].isdigit() else 0))
+
+    return aggregate_games(
+        [row[0] for row in rows],
+        [row[1] for row in rows],
+        [int(row[2] or 0) for row in rows],
+        [row[3].strip().lower() in WON_VALUES for row in rows],
+        _worker['word_scores'],
+    )
+
+
+def recompute_leaderboard(source, output=OUTPUT_FILE, table='games', shards=DEFAULT_SHARDS,
+                          workers=None, word_scores_path=WORD_SCORES_CSV, tmp_dir=None):
+    """Stream, shard and aggregate a game export and write the leaderboard CSV."""
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        paths, games = write_shards(iter_game_rows(source, table), directory, shards)
+        print(f"Sharded {games} games into {shards} shards ({time.perf_counter() - start:.1f}s)")
+
+        results = []
+        if workers == 1:
+            _init_worker(word_scores_path)
+            for path in paths:
+                results.extend(aggregate_shard(path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(word_scores_path,)) as pool:
+                for shard_results in pool.map(aggregate_shard, paths):
+                    results.extend(shard_results)
+
+    results.sort(key=lambda row: (-row[3], row[0]))
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rank'] + AGGREGATE_COLUMNS)
+        for rank, row in enumerate(results, 1):
+            player_id, games_played, wins, total, average, average_attempts, streak, max_streak = row
+            writer.writerow([rank, player_id, games_played, wins, total, f"{average:.4f}",
+                             f"{average_attempts:.4f}", streak, max_streak])
+
+    print(f"Wrote {len(results)} players to {output} ({time.perf_counter() - start:.1f}s)")
+    return len(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute player leaderboards from a game history export")
+    parser.add_argument('source', help="CSV file or sqlite database (.db/.sqlite) of game rows")
+    parser.add_argument('--table', default='games', help="table to read from a sqlite source")
+    parser.add_argument('--output', default=str(OUTPUT_FILE))
+    parser.add_argument('--word-scores', default=str(WORD_SCORES_CSV), help="CSV with word,score columns")
+    parser.add_argument('--shards', type=int, default=DEFAULT_SHARDS,
+                        help="shard files (more shards = less memory per worker)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--tmp-dir', help="where to put the shard files")
+    args = parser.parse_args()
+
+    recompute_leaderboard(args.source, args.output, args.table, args.shards,
+                          args.workers, args.word_scores, args.tmp_dir)
@@ -0,0 +1,31 @@
+"""
+Golden-file tests for attempt_scoring.py against wordle-backend/utils/scoring.js.
+
+scoring_golden.csv holds scoring.js's final score for every base score
+(0.0 - 10.0 in 0.1 steps) and attempt count (0 - 7); regenerate it with
+python attempt_scoring.py --write-golden after changing scoring.js.
+
+Usage:
+    pip install pytest
+    python -m pytest test_attempt_scoring.py
+"""
+
+import shutil
+
+import pytest
+
+from attempt_scoring import GOLDEN_FILE, check_golden, golden_cases
+
+
+def test_golden_table_covers_every_case():
+    with open(GOLDEN_FILE, encoding='utf-8') as f:
+        assert sum(1 for _ in f) - 1 == len(golden_cases())
+
+
+def test_scores_match_golden_table():
+    assert check_golden() == []
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node to run scoring.js")
+def test_scores_match_scoring_js():
+    assert check_golden(node=True) == []
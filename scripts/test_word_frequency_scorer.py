@@ -0,0 +1,76 @@
+"""
+Tests for the word frequency scores (calculate_score / calculate_scores).
+
+The scores are checked against fixed values, against the original per-word
+formula written out below, and against the committed words_by_score.csv.
+
+Usage:
+    pip install pytest
+    python -m pytest test_word_frequency_scorer.py
+"""
+
+import csv
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from word_frequency_scorer import calculate_score, calculate_scores
+
+WORDS_BY_SCORE_CSV = Path(__file__).parent / "words_by_score.csv"
+
+# Frequency range of the shipped words_by_score.csv
+MIN_FREQ = 1
+MAX_FREQ = 3148528
+
+
+def reference_score(frequency, max_freq, min_freq):
+    """The original one-word-at-a-time formula."""
+    if frequency <= 0:
+        return 10.0
+    log_freq = math.log10(frequency + 1)
+    log_max = math.log10(max_freq + 1)
+    log_min = math.log10(min_freq + 1)
+    if log_max == log_min:
+        normalized = 0.5
+    else:
+        normalized = 1 - (log_freq - log_min) / (log_max - log_min)
+    return round(1 + normalized * 9, 1)
+
+
+@pytest.mark.parametrize('frequency, expected', [
+    (-5, 10.0), (0, 10.0), (1, 10.0), (10, 8.9), (100, 7.5), (1000, 6.1),
+    (10000, 4.6), (100000, 3.2), (1000000, 1.7), (MAX_FREQ, 1.0),
+])
+def test_fixed_scores(frequency, expected):
+    assert calculate_score(frequency, MAX_FREQ, MIN_FREQ) == expected
+    assert calculate_scores([frequency], MAX_FREQ, MIN_FREQ)[0] == expected
+
+
+def test_matches_reference_formula_across_range():
+    rng = np.random.default_rng(0)
+    sampled = (10 ** rng.uniform(0, math.log10(MAX_FREQ), 20000)).astype(np.int64)
+    frequencies = np.unique(np.concatenate([np.arange(-2, 2000), sampled, [MAX_FREQ]]))
+
+    scores = calculate_scores(frequencies, MAX_FREQ, MIN_FREQ)
+    for frequency, score in zip(frequencies.tolist(), scores.tolist()):
+        assert score == reference_score(frequency, MAX_FREQ, MIN_FREQ)
+
+
+def test_defaults_to_matched_extremes():
+    frequencies = [0, 5, 50, 5000, 0, 500000]
+    assert calculate_scores(frequencies).tolist() == [reference_score(f, 500000, 5) for f in frequencies]
+
+
+def test_single_frequency_scores_midpoint():
+    assert calculate_score(7, 7, 7) == 5.5
+    assert calculate_scores([7, 7]).tolist() == [5.5, 5.5]
+    assert calculate_scores([0, 0]).tolist() == [10.0, 10.0]
+
+
+def test_reproduces_shipped_scores():
+    with open(WORDS_BY_SCORE_CSV, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    frequencies = [int(row['frequency']) for row in rows]
+    assert calculate_scores(frequencies).tolist() == [float(row['score']) for row in rows]
@@ -8,6 +8,21 @@ This script:
 3. Calculates a score based on Zipf's law / Pareto distribution
 4. Updates the words table with frequency and score columns
 
+Updates are applied in bulk by default: all scores are computed in memory,
+staged into a temporary table (batched executemany, or LOAD DATA LOCAL
+INFILE with --load-data) and applied with one joined UPDATE. --row-by-row
+keeps the old one-UPDATE-per-word path. --dry-run FILE writes the would-be
+values to CSV instead of touching the database.
+
+Large local corpora can be given with --frequency-files A B ...: they are
+streamed in chunks, merged (counts summed across files) and checkpointed to
+--resume-file, so an interrupted load picks up where it stopped.
+
+--rescore [CSV] works offline from words_by_score.csv: after a change to the
+score curve it recomputes every score from the frequency column in one
+vectorized pass, prints a histogram of score changes and writes only the
+rows whose score changed (to the database, or to --dry-run FILE).
+
 Scoring logic:
 - Common words (top 20%) get low scores (1-2 points)
 - Uncommon words get progressively higher scores
@@ -15,16 +30,22 @@ Scoring logic:
 - Max score capped at 10
 
 Usage:
-    pip install python-dotenv mysql-connector-python requests
+    pip install python-dotenv mysql-connector-python requests numpy
     python word_frequency_scorer.py
+    python word_frequency_scorer.py --load-data
+    python word_frequency_scorer.py --dry-run scores.csv --words-csv words_by_score.csv
+    python word_frequency_scorer.py --frequency-files corpus1.txt corpus2.txt --resume-file load.json
+    python word_frequency_scorer.py --rescore --dry-run changed.csv
 """
 
 import os
 import sys
 import csv
-import math
+import json
+import argparse
+import tempfile
 import zipfile
-import requests
+import numpy as np
 import mysql.connector
 from pathlib import Path
 from dotenv import load_dotenv
@@ -45,6 +66,14 @@ DB_CONFIG = {
 # For now, we'll use a direct frequency list from a public source
 FREQUENCY_DATA_URL = "https://raw.githubusercontent.com/hermitdave/FrequencyWords/master/content/2018/en/en_full.txt"
 FREQUENCY_FILE = Path(__file__).parent / "word_frequencies.txt"
+WORDS_CSV = Path(__file__).parent / "words_by_score.csv"
+
+# Rows per executemany batch when staging bulk updates
+BULK_BATCH_SIZE = 1000
+
+# Bytes read per chunk when streaming frequency files, and between checkpoints
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+CHECKPOINT_INTERVAL = 256 * 1024 * 1024
 
 
 def download_frequency_data():
@@ -53,6 +82,8 @@ def download_frequency_data():
         print(f"Frequency data already exists at {FREQUENCY_FILE}")
         return True
 
+    import requests
+
     print(f"Downloading word frequency data from {FREQUENCY_DATA_URL}...")
     try:
         response = requests.get(FREQUENCY_DATA_URL, timeout=60)
@@ -90,6 +121,155 @@ def load_frequency_data():
     return frequencies
 
 
+def _parse_text_line(line):
+    """load_frequency_data's rule for one decoded line: (WORD, frequency) or None."""
+    parts = line.strip().split()
+    if len(parts) >= 2:
+        word = parts[0].upper()
+        if len(word) == 5 and word.isalpha():
+            try:
+                return word, int(parts[1])
+            except ValueError:
+                return None
+    return None
+
+
+def parse_frequency_line(line):
+    """
+    (WORD, frequency) for a 'word count' line of a 5-letter alphabetic word, else None.
+
+    Takes bytes and matches load_frequency_data exactly; ASCII lines (nearly
+    all of them) are handled without decoding, splitting at most twice.
+    """
+    if not line.isascii():
+        return _parse_text_line(line.decode('utf-8', errors='replace'))
+
+    parts = line.split(None, 2)
+    if len(parts) < 2:
+        return None
+    token = parts[0]
+    if len(token) != 5 or not token.isalpha():
+        return None
+    try:
+        return token.upper().decode('ascii'), int(parts[1])
+    except ValueError:
+        return None
+
+
+# Separators str.split() honours but bytes.split() does not
+_CONTROL_SPACES = bytes.maketrans(bytes(range(0x1c, 0x20)), b' ' * 4)
+
+
+def parse_frequency_block(block):
+    """(WORD, frequency) pairs for the lines of a block of whole lines."""
+    if b'\r' in block:
+        # Text-mode reads also end lines at a bare \r
+        block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    lines = block.translate(_CONTROL_SPACES).split(b'\n')
+    return [entry for entry in map(parse_frequency_line, lines) if entry]
+
+
+def iter_frequency_chunks(path, start=0, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a frequency file in chunks of whole lines.
+
+    Yields (entries, end_offset): the (WORD, frequency) pairs of the chunk's
+    lines and the byte offset just past them, so a load can be resumed
+    from any yielded offset.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        pending = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            block = pending + chunk
+            cut = block.rfind(b'\n') + 1
+            block, pending = block[:cut], block[cut:]
+            offset += len(chunk)
+            yield parse_frequency_block(block), offset - len(pending)
+        if pending:
+            yield parse_frequency_block(pending), offset
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {'path': str(Path(path).resolve()), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _save_checkpoint(resume_file, state):
+    tmp = f"{resume_file}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, resume_file)
+
+
+def load_frequency_sources(paths, resume_file=None, chunk_size=STREAM_CHUNK_SIZE,
+                           checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Stream and merge several local frequency files into one {WORD: frequency} dict.
+
+    Within a file a repeated word keeps its last count (as load_frequency_data
+    does); across files counts are summed. With resume_file, progress is
+    checkpointed every checkpoint_interval bytes (and on Ctrl-C), and a
+    rerun with the same files continues from the last checkpoint.
+    """
+    for path in paths:
+        if '://' in str(path) or not Path(path).is_file():
+            raise FileNotFoundError(f"Frequency file must be a local file: {path}")
+
+    signatures = [_source_signature(path) for path in paths]
+    state = {'sources': signatures, 'done': [], 'current': None, 'offset': 0, 'partial': {}, 'totals': {}}
+    if resume_file and Path(resume_file).exists():
+        with open(resume_file, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('sources') == signatures:
+            state = saved
+            print(f"Resuming: {len(state['done'])} of {len(paths)} files done")
+        else:
+            print(f"Ignoring {resume_file}: the frequency files changed")
+
+    totals = state['totals']
+    for index, path in enumerate(paths):
+        if index in state['done']:
+            continue
+
+        resuming = state['current'] == index
+        partial = state['partial'] if resuming else {}
+        start = state['offset'] if resuming else 0
+        next_checkpoint = start + checkpoint_interval
+        print(f"Streaming {path}" + (f" from byte {start:,}" if start else ""))
+
+        offset = start
+        try:
+            for entries, offset in iter_frequency_chunks(path, start, chunk_size):
+                partial.update(entries)
+                if resume_file and offset >= next_checkpoint:
+                    state.update(current=index, offset=offset, partial=partial)
+                    _save_checkpoint(resume_file, state)
+                    next_checkpoint = offset + checkpoint_interval
+        except KeyboardInterrupt:
+            if resume_file:
+                state.update(current=index, offset=offset, partial=partial)
+                _save_checkpoint(resume_file, state)
+                print(f"Interrupted; progress saved to {resume_file}")
+            raise
+
+        for word, freq in partial.items():
+            totals[word] = totals.get(word, 0) + freq
+        state.update(done=state['done'] + [index], current=None, offset=0, partial={})
+        if resume_file:
+            _save_checkpoint(resume_file, state)
+
+    if resume_file and Path(resume_file).exists():
+        os.remove(resume_file)
+
+    print(f"Loaded {len(totals)} 5-letter word frequencies from {len(paths)} files")
+    return totals
+
+
 def calculate_score(frequency, max_freq, min_freq):
     """
     Calculate score based on word frequency using log scaling.
@@ -98,26 +278,78 @@ def calculate_score(frequency, max_freq, min_freq):
     - Low frequency (rare) words get HIGH scores (harder to guess)
     - Uses logarithmic scaling to handle the Zipf distribution
     - Scores range from 1 to 10
+
+    Single-word form of calculate_scores.
+    """
+    return float(calculate_scores([frequency], max_freq, min_freq)[0])
+
+
+def calculate_scores(frequencies, max_freq=None, min_freq=None):
     """
-    if frequency <= 0:
-        return 10  # Unknown words get max score
+    Score a whole word list at once (see calculate_score).
+
+    max_freq and min_freq default to the extremes of the words with
+    frequency > 0, as in compute_word_scores. Words with no frequency get
+    the max score. Returns a float array of scores (1.0 - 10.0).
+    """
+    frequencies = np.asarray(frequencies, dtype=np.int64)
+    matched = frequencies > 0
+    if not matched.any():
+        return np.full(len(frequencies), 10.0)
+
+    if max_freq is None:
+        max_freq = frequencies[matched].max()
+    if min_freq is None:
+        min_freq = frequencies[matched].min()
 
     # Log scale the frequency
-    log_freq = math.log10(frequency + 1)
-    log_max = math.log10(max_freq + 1)
-    log_min = math.log10(min_freq + 1)
+    log_freq = np.log10(np.maximum(frequencies, 0) + 1.0)
+    log_max = np.log10(max_freq + 1.0)
+    log_min = np.log10(min_freq + 1.0)
 
     # Normalize to 0-1 range (inverted: high freq = low score)
     if log_max == log_min:
-        normalized = 0.5
+        normalized = np.full(len(frequencies), 0.5)
     else:
         normalized = 1 - (log_freq - log_min) / (log_max - log_min)
 
-    # Scale to 1-10 range
-    score = 1 + (normalized * 9)
+    # Scale to 1-10 range, one decimal place
+    return np.where(matched, np.round(1 + normalized * 9, 1), 10.0)
+
+
+def rescore_words_csv(path):
+    """
+    Offline rescoring: recompute every score from a words CSV's frequency column.
+
+    Returns (changed, old_scores, new_scores): changed holds (id, word,
+    frequency, new score) rows whose score differs from the CSV's score
+    column at the database's one-decimal precision.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [(int(row['id']), row['word'], int(row['frequency']), float(row['score']))
+                for row in csv.DictReader(f)]
+
+    frequencies = np.array([row[2] for row in rows], dtype=np.int64)
+    old_scores = np.array([row[3] for row in rows])
+    new_scores = calculate_scores(frequencies)
+
+    # Compare in tenths (DECIMAL(3,1)) so float noise never counts as a change
+    diff = np.flatnonzero(np.rint(old_scores * 10) != np.rint(new_scores * 10))
+    changed = [(rows[i][0], rows[i][1], rows[i][2], float(new_scores[i])) for i in diff]
 
-    # Round to 1 decimal place
-    return round(score, 1)
+    print(f"Rescored {len(rows)} words from {path}: {len(changed)} changed")
+    return changed, old_scores, new_scores
+
+
+def print_score_change_histogram(old_scores, new_scores, width=40):
+    """Print how many words moved by each score delta (in 0.1 steps)."""
+    deltas = (np.rint(new_scores * 10) - np.rint(old_scores * 10)).astype(np.int64)
+    values, counts = np.unique(deltas, return_counts=True)
+
+    print("\nScore change histogram (new - old):")
+    scale = width / counts.max() if len(counts) else 0
+    for value, n in zip(values, counts):
+        print(f"  {value / 10:+5.1f} {n:>7}  {'#' * max(1, int(n * scale))}")
 
 
 def get_words_from_db():
@@ -157,46 +389,131 @@ def add_frequency_columns():
     print("Columns ready")
 
 
-def update_word_frequencies(words, frequencies):
-    """Update the database with frequency and score data."""
-    conn = mysql.connector.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+def load_words_from_csv(path):
+    """Read (id, word) pairs from a CSV with id and word columns (e.g. words_by_score.csv)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        words = [(int(row['id']), row['word']) for row in csv.DictReader(f)]
+
+    print(f"Read {len(words)} words from {path}")
+    return words
+
+
+def compute_word_scores(words, frequencies):
+    """
+    Compute frequency and score for every word in memory.
 
+    Returns a list of (id, word, frequency, score) rows, or None if no word
+    has frequency data.
+    """
     # Find min/max frequencies for scoring
     matched_freqs = [frequencies.get(word, 0) for _, word in words if frequencies.get(word, 0) > 0]
 
     if not matched_freqs:
         print("No frequency matches found!")
-        return
+        return None
 
     max_freq = max(matched_freqs)
     min_freq = min(matched_freqs)
 
     print(f"Frequency range: {min_freq:,} to {max_freq:,}")
 
-    # Update each word
-    matched_count = 0
-    unmatched_count = 0
+    freqs = [frequencies.get(word, 0) for _, word in words]
+    scores = calculate_scores(freqs, max_freq, min_freq)
+    rows = [(word_id, word, freq, float(score)) for (word_id, word), freq, score in zip(words, freqs, scores)]
 
-    update_query = "UPDATE words SET frequency = %s, score = %s WHERE id = %s"
+    matched_count = len(matched_freqs)
+    print(f"Scored {matched_count} words with frequency data")
+    print(f"{len(rows) - matched_count} words had no frequency match (assigned score 10)")
+    return rows
 
-    for word_id, word in words:
-        freq = frequencies.get(word, 0)
 
-        if freq > 0:
-            matched_count += 1
-        else:
-            unmatched_count += 1
+def write_scores_csv(rows, path):
+    """Dry run: write the would-be (id, word, frequency, score) rows to CSV."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'word', 'frequency', 'score'])
+        writer.writerows(rows)
+
+    print(f"Dry run: wrote {len(rows)} would-be updates to {path}")
 
-        score = calculate_score(freq, max_freq, min_freq)
+
+def update_word_frequencies(words, frequencies):
+    """Update the database with frequency and score data, one UPDATE per word."""
+    rows = compute_word_scores(words, frequencies)
+    if rows is None:
+        return
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    update_query = "UPDATE words SET frequency = %s, score = %s WHERE id = %s"
+
+    for word_id, _, freq, score in rows:
         cursor.execute(update_query, (freq, score, word_id))
 
     conn.commit()
     cursor.close()
     conn.close()
 
-    print(f"Updated {matched_count} words with frequency data")
-    print(f"{unmatched_count} words had no frequency match (assigned score 10)")
+    print(f"Updated {len(rows)} words")
+
+
+def bulk_update_word_frequencies(rows, batch_size=BULK_BATCH_SIZE, load_data=False):
+    """
+    Apply computed (id, word, frequency, score) rows with one joined UPDATE.
+
+    Rows are staged into a temporary table through batched executemany
+    (or LOAD DATA LOCAL INFILE when load_data is True), then copied into
+    words in a single statement, all in one transaction.
+    """
+    conn = mysql.connector.connect(**DB_CONFIG, allow_local_infile=load_data)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            CREATE TEMPORARY TABLE word_score_updates (
+                id INT PRIMARY KEY,
+                frequency BIGINT NOT NULL,
+                score DECIMAL(3,1) NOT NULL
+            )
+        """)
+
+        staged = [(word_id, freq, score) for word_id, _, freq, score in rows]
+
+        if load_data:
+            with tempfile.NamedTemporaryFile('w', newline='', suffix='.csv', delete=False) as f:
+                csv.writer(f).writerows(staged)
+                staging_file = f.name
+            try:
+                cursor.execute(
+                    "LOAD DATA LOCAL INFILE %s INTO TABLE word_score_updates "
+                    "FIELDS TERMINATED BY ',' LINES TERMINATED BY '\\r\\n' (id, frequency, score)",
+                    (staging_file,)
+                )
+            finally:
+                os.remove(staging_file)
+        else:
+            insert_query = "INSERT INTO word_score_updates (id, frequency, score) VALUES (%s, %s, %s)"
+            for start in range(0, len(staged), batch_size):
+                cursor.executemany(insert_query, staged[start:start + batch_size])
+
+        cursor.execute("""
+            UPDATE words w
+            JOIN word_score_updates u ON u.id = w.id
+            SET w.frequency = u.frequency, w.score = u.score
+        """)
+        updated = cursor.rowcount
+
+        cursor.execute("DROP TEMPORARY TABLE word_score_updates")
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Bulk-updated {len(rows)} words ({updated} rows changed)")
 
 
 def show_sample_results():
@@ -250,25 +567,66 @@ def show_sample_results():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Score words by corpus frequency and update the words table")
+    parser.add_argument('--row-by-row', action='store_true',
+                        help="issue one UPDATE per word instead of the bulk staging-table update")
+    parser.add_argument('--load-data', action='store_true',
+                        help="stage bulk updates with LOAD DATA LOCAL INFILE instead of executemany")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE,
+                        help="rows per executemany batch when staging")
+    parser.add_argument('--dry-run', metavar='CSV',
+                        help="write the would-be (id, word, frequency, score) rows here; no DB writes")
+    parser.add_argument('--words-csv', metavar='CSV',
+                        help="read (id, word) from this CSV instead of the words table")
+    parser.add_argument('--frequency-files', nargs='+', metavar='FILE',
+                        help="stream and merge these local 'word count' files instead of downloading")
+    parser.add_argument('--resume-file', metavar='JSON',
+                        help="checkpoint file for resuming an interrupted --frequency-files load")
+    parser.add_argument('--rescore', nargs='?', const=str(WORDS_CSV), metavar='CSV',
+                        help="recompute scores from this CSV's frequency column (default "
+                             "words_by_score.csv) and write only the changed rows")
+    args = parser.parse_args()
+
     print("="*60)
     print("WORD FREQUENCY SCORER FOR WORDLE")
     print("="*60 + "\n")
 
-    # Step 1: Download frequency data
-    if not download_frequency_data():
-        sys.exit(1)
+    # Offline rescoring: no download, only changed rows are written
+    if args.rescore:
+        changed, old_scores, new_scores = rescore_words_csv(args.rescore)
+        print_score_change_histogram(old_scores, new_scores)
+        if args.dry_run:
+            write_scores_csv(changed, args.dry_run)
+        elif changed:
+            bulk_update_word_frequencies(changed, args.batch_size, args.load_data)
+        return
 
-    # Step 2: Load frequency data
-    frequencies = load_frequency_data()
+    # Steps 1-2: Download and load frequency data (or stream local corpora)
+    if args.frequency_files:
+        frequencies = load_frequency_sources(args.frequency_files, args.resume_file)
+    else:
+        if not download_frequency_data():
+            sys.exit(1)
+        frequencies = load_frequency_data()
 
     # Step 3: Add columns to database
-    add_frequency_columns()
+    if not args.dry_run:
+        add_frequency_columns()
 
-    # Step 4: Get words from database
-    words = get_words_from_db()
+    # Step 4: Get words from database (or a CSV export)
+    words = load_words_from_csv(args.words_csv) if args.words_csv else get_words_from_db()
 
     # Step 5: Update words with frequencies and scores
-    update_word_frequencies(words, frequencies)
+    if args.row_by_row and not args.dry_run:
+        update_word_frequencies(words, frequencies)
+    else:
+        rows = compute_word_scores(words, frequencies)
+        if rows is None:
+            sys.exit(1)
+        if args.dry_run:
+            write_scores_csv(rows, args.dry_run)
+            return
+        bulk_update_word_frequencies(rows, args.batch_size, args.load_data)
 
     # Step 6: Show sample results
     show_sample_results()